@@ -1,7 +1,64 @@
 """Utilities for integrating PDF generation workers with the Job Manager."""
 
+from .admission import MemoryAdmission, process_tree_rss
+from .callback import JobCallbackServer
+from .fetcher import JobBuffer, PrefetchingFetcher
+from .http_pool import ConnectionStats
+from .load_reporter import LoadReporter
+from .load_sampler import LoadSample, ProcLoadSampler, StaticLoadSampler
+from .local_job_manager import LocalJobManager, leasing_job_fetcher
+from .metrics import MetricsRegistry, MetricsServer, WorkerMetrics, merge_expositions
 from .pdf_job_worker import PdfJobWorker, WorkerConfig
+from .render_pool import RenderPool
+from .renderers import RendererRegistry, default_registry, register_renderer
+from .result_cache import ResultCache, cache_key
+from .result_queue import PendingResult, ResultSubmitter
+from .retry import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    PdfApiStatusError,
+    RetryPolicy,
+)
+from .scheduling import PriorityJobBuffer, job_priority
+from .supervisor import WorkerSupervisor, build_worker
 
-__all__ = ["PdfJobWorker", "WorkerConfig"]
+__all__ = [
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "ConnectionStats",
+    "JobBuffer",
+    "JobCallbackServer",
+    "LoadReporter",
+    "LoadSample",
+    "LocalJobManager",
+    "MemoryAdmission",
+    "MetricsRegistry",
+    "MetricsServer",
+    "PdfApiStatusError",
+    "PendingResult",
+    "PrefetchingFetcher",
+    "PriorityJobBuffer",
+    "PdfJobWorker",
+    "ProcLoadSampler",
+    "RenderPool",
+    "RendererRegistry",
+    "ResultCache",
+    "ResultSubmitter",
+    "RetryPolicy",
+    "StaticLoadSampler",
+    "WorkerConfig",
+    "WorkerMetrics",
+    "WorkerSupervisor",
+    "build_worker",
+    "cache_key",
+    "default_registry",
+    "job_priority",
+    "leasing_job_fetcher",
+    "merge_expositions",
+    "process_tree_rss",
+    "register_renderer",
+]
 
 
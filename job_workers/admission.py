@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from .serialization import dumps
+
+
+logger = logging.getLogger(__name__)
+
+
+def read_rss(pid: Any = "self", proc_root: str = "/proc") -> int:
+    """Current resident set size of ``pid`` in bytes (``0`` when it cannot be read)."""
+    try:
+        with open(os.path.join(proc_root, str(pid), "statm"), "r", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def process_tree_rss(extra_pids: Callable[[], Iterable[int]] = tuple) -> Callable[[], int]:
+    """RSS reader summing this process and ``extra_pids()`` (e.g. render pool children)."""
+    return lambda: read_rss() + sum(read_rss(pid) for pid in extra_pids())
+
+
+def job_class(job_data: Dict[str, Any]) -> str:
+    """Key grouping jobs with similar memory profiles: renderer or PDF API endpoint."""
+    job_type = job_data.get("job_type") or {}
+    if "RustJob" in job_type:
+        local_job = job_type["RustJob"] or {}
+        return f"{local_job.get('module', '')}.{local_job.get('function', '')}"
+    if "WebApiJob" in job_type:
+        return (job_type["WebApiJob"] or {}).get("url") or "WebApiJob"
+    return "unknown"
+
+
+@dataclass
+class _Reservation:
+    job_class: str
+    estimate: int
+    rss_at_start: int
+    peak_rss: int
+
+
+class MemoryAdmission:
+    """Refuse jobs whose projected memory would push the worker past a budget.
+
+    A job's cost is estimated from the peak RSS growth observed for earlier jobs of the
+    same class (renderer or PDF API endpoint) or, without history, from its payload size.
+    A new job is admitted when ``live RSS + unrealised reservations + estimate`` stays
+    within ``budget_bytes``; the unrealised part of a reservation is whatever a running
+    job has not allocated yet. With nothing running every job is admitted, so an
+    oversized job runs alone instead of starving. Growth is attributed to each running
+    job in full, which overestimates under concurrency and errs on the safe side.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        *,
+        rss_reader: Optional[Callable[[], int]] = None,
+        default_estimate: int = 64 * 1024 * 1024,
+        payload_multiplier: float = 8.0,
+        history_size: int = 20,
+        sample_interval: float = 0.25,
+    ) -> None:
+        """
+        Args:
+            budget_bytes: RSS the worker must stay under.
+            rss_reader: Callable returning live RSS in bytes; defaults to this process.
+            default_estimate: Cost assumed for a job class without history.
+            payload_multiplier: Bytes of memory assumed per byte of job payload (embedded
+                images and tables expand a lot once decoded and drawn).
+            history_size: Observations kept per job class.
+            sample_interval: Seconds between RSS samples while jobs run.
+        """
+        self.budget_bytes = budget_bytes
+        self.rss_reader = rss_reader or read_rss
+        self.default_estimate = default_estimate
+        self.payload_multiplier = payload_multiplier
+        self.history_size = max(history_size, 1)
+        self.sample_interval = sample_interval
+        self.refusals = 0
+        self._history: Dict[str, Deque[int]] = {}
+        self._reservations: Dict[str, _Reservation] = {}
+        self._live_rss = 0
+
+    @property
+    def live_rss(self) -> int:
+        return self._live_rss
+
+    def sample(self) -> int:
+        """Read RSS now and fold it into the peaks of running jobs."""
+        self._live_rss = self.rss_reader()
+        for reservation in self._reservations.values():
+            reservation.peak_rss = max(reservation.peak_rss, self._live_rss)
+        return self._live_rss
+
+    def estimate(self, job_data: Dict[str, Any]) -> int:
+        payload_estimate = int(_payload_size(job_data) * self.payload_multiplier)
+        history = self._history.get(job_class(job_data))
+        if history:
+            return max(max(history), payload_estimate)
+        return max(self.default_estimate, payload_estimate)
+
+    def reserved(self) -> int:
+        """Memory promised to running jobs that they have not allocated yet."""
+        return sum(
+            max(item.estimate - max(item.peak_rss - item.rss_at_start, 0), 0)
+            for item in self._reservations.values()
+        )
+
+    def projected(self, job_data: Dict[str, Any]) -> int:
+        return self._live_rss + self.reserved() + self.estimate(job_data)
+
+    def try_admit(self, job_id: str, job_data: Dict[str, Any]) -> bool:
+        """Reserve memory for the job, or return ``False`` when it does not fit."""
+        rss = self.sample()
+        estimate = self.estimate(job_data)
+        projected = rss + self.reserved() + estimate
+        if projected > self.budget_bytes and self._reservations:
+            self.refusals += 1
+            logger.debug(
+                "Deferring job %s: projected %s bytes exceeds budget %s",
+                job_id,
+                projected,
+                self.budget_bytes,
+            )
+            return False
+        if projected > self.budget_bytes:
+            logger.warning(
+                "Job %s is estimated at %s bytes, over the %s byte budget; running it alone",
+                job_id,
+                estimate,
+                self.budget_bytes,
+            )
+        self._reservations[job_id] = _Reservation(job_class(job_data), estimate, rss, rss)
+        return True
+
+    def release(self, job_id: str) -> None:
+        """Free a job's reservation and learn its observed peak growth."""
+        reservation = self._reservations.pop(job_id, None)
+        if reservation is None:
+            return
+        self.sample()
+        reservation.peak_rss = max(reservation.peak_rss, self._live_rss)
+        growth = max(reservation.peak_rss - reservation.rss_at_start, 0)
+        history = self._history.setdefault(reservation.job_class, deque(maxlen=self.history_size))
+        history.append(growth)
+
+    def running(self) -> int:
+        return len(self._reservations)
+
+    async def run(self) -> None:
+        """Sample RSS while jobs run so their peaks are observed; runs until cancelled."""
+        while True:
+            if self._reservations:
+                self.sample()
+            await asyncio.sleep(self.sample_interval)
+
+
+def _payload_size(job_data: Dict[str, Any]) -> int:
+    job_type = job_data.get("job_type") or {}
+    try:
+        return len(dumps(job_type))
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,77 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from .http_pool import bound_port
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobCallbackServer:
+    """Local HTTP listener the Job Manager can push jobs to.
+
+    ``POST {path}`` takes a job payload (``id`` and ``job_type``, as returned by the Job
+    Manager) and hands it to ``accept``. A ``False`` return means the worker has no room
+    and is answered with ``429 Too Many Requests`` plus ``Retry-After``; accepted jobs get
+    ``202 Accepted``.
+    """
+
+    def __init__(
+        self,
+        accept: Callable[[Dict[str, Any]], bool],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/jobs",
+        retry_after: int = 1,
+    ) -> None:
+        self.accept = accept
+        self.host = host
+        self.port = port
+        self.path = path
+        self.retry_after = retry_after
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        return bound_port(self._runner)
+
+    @property
+    def url(self) -> Optional[str]:
+        port = self.bound_port
+        return f"http://{self.host}:{port}{self.path}" if port is not None else None
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_post(self.path, self._handle_job)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Job callback listener on %s", self.url)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_job(self, request: web.Request) -> web.Response:
+        try:
+            job_data = await request.json()
+        except ValueError:
+            return web.json_response({"error": "invalid JSON"}, status=400)
+        if not isinstance(job_data, dict) or not job_data.get("id") or not isinstance(
+            job_data.get("job_type"), dict
+        ):
+            return web.json_response({"error": "id and job_type are required"}, status=400)
+
+        if not self.accept(job_data):
+            return web.json_response(
+                {"error": "worker at capacity", "job_id": job_data["id"]},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        return web.json_response({"job_id": job_data["id"], "accepted": True}, status=202)
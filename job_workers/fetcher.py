@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobBuffer:
+    """FIFO buffer of fetched jobs waiting for a free execution slot."""
+
+    def __init__(self) -> None:
+        self._items: Deque[Dict[str, Any]] = deque()
+
+    def put(self, job_data: Dict[str, Any]) -> None:
+        self._items.append(job_data)
+
+    def pop(self) -> Dict[str, Any]:
+        return self._items.popleft()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class PrefetchingFetcher:
+    """Keep up to ``prefetch`` jobs buffered ahead of the worker's free capacity.
+
+    When the Job Manager has no work the poll delay grows exponentially from
+    ``poll_interval`` up to ``max_poll_interval``; the first successful fetch resets it.
+    The cap is the worst-case delay before an idle worker notices new work, traded
+    against one Job Manager request per cap interval per idle worker.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+        free_slots: Callable[[], int],
+        *,
+        prefetch: int = 1,
+        poll_interval: float = 2.0,
+        max_poll_interval: float = 5.0,
+        backoff_factor: float = 2.0,
+        buffer: Optional[JobBuffer] = None,
+        on_dequeue: Optional[Callable[[Dict[str, Any], float], None]] = None,
+    ) -> None:
+        """
+        Args:
+            fetch: Coroutine returning the next job payload, or ``None`` when idle.
+            free_slots: Callable returning the number of idle execution slots.
+            prefetch: Number of jobs buffered beyond the free slots.
+            poll_interval: Initial delay (seconds) after an empty poll.
+            max_poll_interval: Upper bound of the idle delay.
+            backoff_factor: Multiplier applied to the delay after each empty poll.
+            buffer: Buffer holding fetched jobs; defaults to a FIFO ``JobBuffer``.
+            on_dequeue: Callback receiving each job handed out and the seconds it waited.
+        """
+        self.fetch = fetch
+        self.free_slots = free_slots
+        self.prefetch = max(prefetch, 0)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(max_poll_interval, poll_interval)
+        self.backoff_factor = backoff_factor
+        self.buffer = buffer if buffer is not None else JobBuffer()
+        self.on_dequeue = on_dequeue
+
+        self.empty_polls: int = 0
+        self._delay = poll_interval
+        self._available = asyncio.Event()
+        self._capacity_changed = asyncio.Event()
+        self._enqueued_at: Dict[int, float] = {}
+
+    @property
+    def current_delay(self) -> float:
+        return self._delay
+
+    def notify_capacity(self) -> None:
+        """Wake the fetch loop after a job finished or capacity changed."""
+        self._capacity_changed.set()
+
+    def put(self, job_data: Dict[str, Any]) -> None:
+        """Add a job obtained outside of polling (e.g. pushed to the worker)."""
+        self._enqueued_at[id(job_data)] = time.monotonic()
+        self.buffer.put(job_data)
+        self._available.set()
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return every buffered job."""
+        self._enqueued_at.clear()
+        return self.buffer.drain()
+
+    async def get(self) -> Dict[str, Any]:
+        """Wait for and return the next buffered job."""
+        while not len(self.buffer):
+            self._available.clear()
+            await self._available.wait()
+        job_data = self.buffer.pop()
+        enqueued_at = self._enqueued_at.pop(id(job_data), None)
+        if self.on_dequeue is not None and enqueued_at is not None:
+            self.on_dequeue(job_data, time.monotonic() - enqueued_at)
+        self._capacity_changed.set()
+        return job_data
+
+    def wanted(self) -> int:
+        return max(self.free_slots(), 0) + self.prefetch - len(self.buffer)
+
+    async def run(self) -> None:
+        """Fetch loop; runs until cancelled."""
+        while True:
+            if self.wanted() <= 0:
+                self._capacity_changed.clear()
+                await self._capacity_changed.wait()
+                continue
+
+            try:
+                job_data = await self.fetch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Job fetch failed: %s", exc)
+                job_data = None
+
+            if job_data:
+                self._delay = self.poll_interval
+                self.put(job_data)
+                continue
+
+            self.empty_polls += 1
+            await asyncio.sleep(self._delay)
+            self._delay = min(self._delay * self.backoff_factor, self.max_poll_interval)
@@ -0,0 +1,90 @@
+import ssl
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import aiohttp
+from aiohttp import web
+
+
+@dataclass
+class ConnectionStats:
+    """Connection reuse counters collected through aiohttp tracing."""
+
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        acquired = self.connections_created + self.connections_reused
+        return self.connections_reused / acquired if acquired else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["reuse_ratio"] = round(self.reuse_ratio, 4)
+        return data
+
+
+def trace_config(stats: ConnectionStats) -> aiohttp.TraceConfig:
+    """Build a ``TraceConfig`` feeding ``stats``."""
+
+    async def on_request_start(session: Any, context: SimpleNamespace, params: Any) -> None:
+        stats.requests += 1
+
+    async def on_connection_create_end(session: Any, context: SimpleNamespace, params: Any) -> None:
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(session: Any, context: SimpleNamespace, params: Any) -> None:
+        stats.connections_reused += 1
+
+    async def on_dns_cache_hit(session: Any, context: SimpleNamespace, params: Any) -> None:
+        stats.dns_cache_hits += 1
+
+    async def on_dns_cache_miss(session: Any, context: SimpleNamespace, params: Any) -> None:
+        stats.dns_cache_misses += 1
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_connection_create_end.append(on_connection_create_end)
+    config.on_connection_reuseconn.append(on_connection_reuseconn)
+    config.on_dns_cache_hit.append(on_dns_cache_hit)
+    config.on_dns_cache_miss.append(on_dns_cache_miss)
+    return config
+
+
+def build_connector(
+    *,
+    limit: int,
+    limit_per_host: int,
+    keepalive_timeout: float,
+    dns_cache_ttl: Optional[int],
+    ssl_context: Optional[ssl.SSLContext],
+) -> aiohttp.TCPConnector:
+    """Create a pooled connector.
+
+    Passing one ``ssl_context`` to several connectors only avoids building it (and loading
+    the CA store) more than once; TLS sessions are not resumed across connections, so
+    handshakes are saved by keep-alive reuse alone.
+    """
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        use_dns_cache=dns_cache_ttl is not None,
+        ttl_dns_cache=dns_cache_ttl,
+        ssl=ssl_context if ssl_context is not None else True,
+    )
+
+
+def bound_port(runner: Optional[web.AppRunner]) -> Optional[int]:
+    """Port an aiohttp runner's first site actually listens on (resolves port ``0``)."""
+    if runner is None:
+        return None
+    for site in runner.sites:
+        server = getattr(site, "_server", None)
+        if server is not None and server.sockets:
+            return server.sockets[0].getsockname()[1]
+    return None
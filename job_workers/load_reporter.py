@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class LoadReporter:
+    """Coalesce worker load changes into rate-limited reports to the Job Manager.
+
+    Job start/finish events only mark the local state as dirty. ``run`` flushes a
+    dirty state at most once per ``min_interval`` and sends a heartbeat at least once
+    per ``heartbeat_interval``. Filling up is flushed immediately so the manager stops
+    routing work to the worker. Any other change between idle, busy and full (including
+    freeing capacity) is flushed once it has lasted ``settle_interval``; a saturated
+    worker that refills a finished slot within that time reports nothing. Job count
+    changes within a level wait for the next coalesced flush.
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[], Awaitable[None]],
+        *,
+        capacity: int,
+        min_interval: float = 1.0,
+        heartbeat_interval: float = 10.0,
+        settle_interval: float = 0.1,
+    ) -> None:
+        """
+        Args:
+            publish: Coroutine that samples and sends the current load.
+            capacity: Maximum number of concurrent jobs of the worker.
+            min_interval: Minimum number of seconds between two non-urgent flushes.
+            heartbeat_interval: Maximum number of seconds between two flushes.
+            settle_interval: Seconds a level change other than filling up must last
+                before it is flushed ahead of ``min_interval``.
+        """
+        self.publish = publish
+        self.capacity = max(capacity, 1)
+        self.min_interval = min_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.settle_interval = settle_interval
+
+        self.flush_count: int = 0
+        self._current_jobs: int = 0
+        self._reported_level: Optional[str] = None
+        self._dirty: bool = True
+        self._last_flush: float = float("-inf")
+        self._wakeup = asyncio.Event()
+        self._urgent: bool = False
+        self._level_changed_at: Optional[float] = None
+
+    def record(self, current_jobs: int) -> None:
+        """Record a job count change; flushing is left to ``run``."""
+        self._current_jobs = current_jobs
+        self._dirty = True
+        level = self._level(current_jobs)
+        if level == self._reported_level:
+            # Back at the reported level before the change was flushed.
+            self._level_changed_at = None
+        elif level == "full":
+            self._urgent = True
+            self._wakeup.set()
+        elif self._level_changed_at is None:
+            self._level_changed_at = time.monotonic()
+            self._wakeup.set()
+
+    def mark_urgent(self) -> None:
+        """Force a flush on the next loop iteration (e.g. a circuit breaker tripped)."""
+        self._dirty = True
+        self._urgent = True
+        self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Publish the current load now, regardless of rate limits."""
+        self._dirty = False
+        self._urgent = False
+        self._level_changed_at = None
+        self._reported_level = self._level(self._current_jobs)
+        self._last_flush = time.monotonic()
+        self.flush_count += 1
+        await self.publish()
+
+    async def run(self) -> None:
+        """Flush loop; runs until cancelled."""
+        while True:
+            now = time.monotonic()
+            since_flush = now - self._last_flush
+            settle_left = (
+                self._level_changed_at + self.settle_interval - now
+                if self._level_changed_at is not None
+                else float("inf")
+            )
+            if (
+                self._urgent
+                or settle_left <= 0
+                or since_flush >= self.heartbeat_interval
+                or (self._dirty and since_flush >= self.min_interval)
+            ):
+                try:
+                    await self.flush()
+                except Exception as exc:
+                    logger.warning("Load report failed: %s", exc)
+                continue
+
+            if self._dirty:
+                timeout = self.min_interval - since_flush
+            else:
+                timeout = self.heartbeat_interval - since_flush
+            timeout = min(timeout, settle_left)
+            self._wakeup.clear()
+            # asyncio.wait rather than wait_for: on 3.11 wait_for swallows a cancellation
+            # that lands just as the event is set, which left stop() waiting on this loop.
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=max(timeout, 0.0))
+            finally:
+                waiter.cancel()
+
+    def _level(self, current_jobs: int) -> str:
+        if current_jobs <= 0:
+            return "idle"
+        if current_jobs >= self.capacity:
+            return "full"
+        return "busy"
@@ -0,0 +1,138 @@
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional, Tuple
+
+
+@dataclass
+class LoadSample:
+    """Smoothed resource usage of the worker process and its host."""
+
+    process_cpu: float
+    host_cpu: float
+    rss_bytes: int
+    memory_usage: float
+
+    @property
+    def cpu_usage(self) -> float:
+        """CPU figure reported to the Job Manager (host-wide busy percentage)."""
+        return self.host_cpu
+
+
+LoadSampler = Callable[[], LoadSample]
+
+
+class ProcLoadSampler:
+    """Read CPU and RSS from ``/proc`` and average them over a sliding window.
+
+    CPU percentages are computed from the delta between two consecutive calls, so
+    the first sample after construction reports 0.0 CPU. Memory usage is the
+    process RSS as a percentage of total host memory.
+    """
+
+    def __init__(self, *, window: int = 6, proc_root: str = "/proc") -> None:
+        """
+        Args:
+            window: Number of raw samples averaged into each reported value.
+            proc_root: Mount point of procfs (overridable for tests/containers).
+        """
+        self.proc_root = proc_root
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._cpu_count = os.cpu_count() or 1
+        self._history: Deque[Tuple[float, float, int]] = deque(maxlen=max(window, 1))
+        self._last_wall: Optional[float] = None
+        self._last_process_ticks: Optional[int] = None
+        self._last_host: Optional[Tuple[int, int]] = None
+        self._mem_total = self._read_mem_total()
+
+    @staticmethod
+    def available(proc_root: str = "/proc") -> bool:
+        return os.path.exists(os.path.join(proc_root, "self", "stat")) and os.path.exists(
+            os.path.join(proc_root, "stat")
+        )
+
+    def __call__(self) -> LoadSample:
+        return self.sample()
+
+    def sample(self) -> LoadSample:
+        now = time.monotonic()
+        process_ticks, rss_pages = self._read_self_stat()
+        host_busy, host_total = self._read_host_stat()
+
+        process_cpu = 0.0
+        host_cpu = 0.0
+        if self._last_wall is not None and self._last_process_ticks is not None:
+            elapsed = now - self._last_wall
+            if elapsed > 0:
+                used = (process_ticks - self._last_process_ticks) / self._clock_ticks
+                process_cpu = 100.0 * used / (elapsed * self._cpu_count)
+        if self._last_host is not None:
+            total_delta = host_total - self._last_host[1]
+            if total_delta > 0:
+                host_cpu = 100.0 * (host_busy - self._last_host[0]) / total_delta
+
+        self._last_wall = now
+        self._last_process_ticks = process_ticks
+        self._last_host = (host_busy, host_total)
+
+        rss_bytes = rss_pages * self._page_size
+        self._history.append((_clamp(process_cpu), _clamp(host_cpu), rss_bytes))
+
+        count = len(self._history)
+        avg_process = sum(item[0] for item in self._history) / count
+        avg_host = sum(item[1] for item in self._history) / count
+        avg_rss = int(sum(item[2] for item in self._history) / count)
+        memory_usage = 100.0 * avg_rss / self._mem_total if self._mem_total else 0.0
+
+        return LoadSample(
+            process_cpu=round(avg_process, 2),
+            host_cpu=round(avg_host, 2),
+            rss_bytes=avg_rss,
+            memory_usage=round(_clamp(memory_usage), 2),
+        )
+
+    def _read_self_stat(self) -> Tuple[int, int]:
+        with open(os.path.join(self.proc_root, "self", "stat"), "r", encoding="ascii") as handle:
+            raw = handle.read()
+        # The command name may contain spaces, so split after its closing paren.
+        fields = raw[raw.rindex(")") + 2:].split()
+        utime, stime = int(fields[11]), int(fields[12])
+        rss_pages = int(fields[21])
+        return utime + stime, rss_pages
+
+    def _read_host_stat(self) -> Tuple[int, int]:
+        with open(os.path.join(self.proc_root, "stat"), "r", encoding="ascii") as handle:
+            values = [int(value) for value in handle.readline().split()[1:]]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)
+        total = sum(values[:8])
+        return total - idle, total
+
+    def _read_mem_total(self) -> int:
+        try:
+            with open(os.path.join(self.proc_root, "meminfo"), "r", encoding="ascii") as handle:
+                for line in handle:
+                    if line.startswith("MemTotal:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            pass
+        return 0
+
+
+class StaticLoadSampler:
+    """Fallback sampler used where ``/proc`` is unavailable; always reports zero load."""
+
+    def __call__(self) -> LoadSample:
+        return LoadSample(process_cpu=0.0, host_cpu=0.0, rss_bytes=0, memory_usage=0.0)
+
+
+def default_load_sampler() -> LoadSampler:
+    """Return a ``/proc`` based sampler when possible, otherwise a static one."""
+    if ProcLoadSampler.available():
+        return ProcLoadSampler()
+    return StaticLoadSampler()
+
+
+def _clamp(value: float) -> float:
+    return min(max(value, 0.0), 100.0)
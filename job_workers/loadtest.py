@@ -0,0 +1,296 @@
+"""End-to-end load test: N ``PdfJobWorker``s against a local Job Manager and mock PDF API.
+
+Example::
+
+    python -m job_workers.loadtest --workers 4 --jobs 500 --service-time 0.05 \\
+        --distribution lognormal --jm-latency 0.002
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import aiohttp
+from aiohttp import web
+
+from .http_pool import bound_port
+from .local_job_manager import LocalJobManager, leasing_job_fetcher
+from .pdf_job_worker import PdfJobWorker, WorkerConfig
+
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+def service_time_sampler(
+    distribution: str, mean: float, *, rng: Optional[random.Random] = None
+) -> Callable[[], float]:
+    """Return a callable drawing service times (seconds) with the given mean."""
+    rng = rng or random.Random()
+    if mean <= 0 or distribution == "fixed":
+        return lambda: max(mean, 0.0)
+    if distribution == "uniform":
+        return lambda: rng.uniform(0.0, 2 * mean)
+    if distribution == "exponential":
+        return lambda: rng.expovariate(1.0 / mean)
+    if distribution == "lognormal":
+        sigma = 0.75
+        mu = math.log(mean) - sigma * sigma / 2
+        return lambda: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown distribution {distribution!r}; expected one of {DISTRIBUTIONS}")
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``0.0`` when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100.0 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class MockPdfApi:
+    """aiohttp ``/generate`` endpoint answering after a sampled service time."""
+
+    def __init__(self, service_time: Callable[[], float], *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.service_time = service_time
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self.peak_in_flight = 0
+        self._in_flight = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        port = bound_port(self._runner)
+        return f"http://{self.host}:{port if port is not None else self.port}/generate"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/generate", self._handle_generate)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_generate(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self._in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+        try:
+            payload = await request.json()
+            await asyncio.sleep(self.service_time())
+        finally:
+            self._in_flight -= 1
+        report_id = payload.get("report_id", "unknown") if isinstance(payload, dict) else "unknown"
+        return web.json_response({"pdf_url": f"http://files.local/{report_id}.pdf"})
+
+
+@dataclass
+class LoadTestReport:
+    """Outcome of one load-test run."""
+
+    workers: int
+    jobs: int
+    completed: int
+    failed: int
+    duration_seconds: float
+    jobs_per_second: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    latency_max: float
+    pdf_api_requests: int
+    pdf_api_peak_in_flight: int
+    control_plane_requests: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def control_plane_total(self) -> int:
+        return sum(self.control_plane_requests.values())
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["control_plane_total"] = self.control_plane_total
+        return data
+
+    def format(self) -> str:
+        lines = [
+            f"workers={self.workers} jobs={self.jobs} completed={self.completed} failed={self.failed}",
+            f"duration: {self.duration_seconds:.3f}s  throughput: {self.jobs_per_second:.1f} jobs/s",
+            "end-to-end latency: "
+            f"p50={self.latency_p50 * 1000:.1f}ms p95={self.latency_p95 * 1000:.1f}ms "
+            f"p99={self.latency_p99 * 1000:.1f}ms max={self.latency_max * 1000:.1f}ms",
+            f"pdf api: {self.pdf_api_requests} requests, peak {self.pdf_api_peak_in_flight} in flight",
+            f"control plane: {self.control_plane_total} requests"
+            f" ({self.control_plane_total / max(self.jobs, 1):.2f} per job)",
+        ]
+        lines.extend(
+            f"  {route}: {count}" for route, count in sorted(self.control_plane_requests.items())
+        )
+        return "\n".join(lines)
+
+
+async def run_load_test(
+    *,
+    workers: int = 2,
+    jobs: int = 100,
+    max_concurrent_jobs: int = 4,
+    service_time: float = 0.05,
+    distribution: str = "exponential",
+    jm_latency: float = 0.0,
+    arrival_rate: Optional[float] = None,
+    poll_interval: float = 0.05,
+    max_poll_interval: float = 1.0,
+    prefetch_jobs: int = 1,
+    push: bool = False,
+    timeout: float = 300.0,
+    seed: Optional[int] = None,
+    worker_options: Optional[Dict[str, Any]] = None,
+) -> LoadTestReport:
+    """Push ``jobs`` jobs through ``workers`` workers and measure the run.
+
+    Args:
+        workers: Number of ``PdfJobWorker`` instances sharing the local Job Manager.
+        jobs: Number of jobs pushed through ``POST /jobs``.
+        max_concurrent_jobs: Execution slots per worker.
+        service_time: Mean PDF API service time in seconds.
+        distribution: Service-time distribution, one of ``DISTRIBUTIONS``.
+        jm_latency: Seconds injected into every Job Manager request.
+        arrival_rate: Jobs per second submitted (Poisson arrivals); ``None`` submits all at once.
+        poll_interval: Worker idle poll interval.
+        max_poll_interval: Upper bound of the worker idle poll backoff.
+        prefetch_jobs: Jobs each worker fetches ahead of its free slots.
+        push: Run each worker's callback listener so the Job Manager pushes jobs;
+            leasing stays enabled as the polling fallback.
+        timeout: Seconds to wait for all jobs to finish.
+        seed: Seed for the service-time and arrival generators.
+        worker_options: Extra keyword arguments for every ``PdfJobWorker``.
+    """
+    rng = random.Random(seed)
+    pdf_api = MockPdfApi(service_time_sampler(distribution, service_time, rng=rng))
+    manager = LocalJobManager(latency=jm_latency)
+    pool: List[PdfJobWorker] = []
+    submitted_at: Dict[str, float] = {}
+
+    await pdf_api.start()
+    await manager.start()
+    try:
+        for index in range(workers):
+            worker = PdfJobWorker(
+                job_manager_url=manager.url,
+                worker_id=f"loadtest-worker-{index}",
+                worker_config=WorkerConfig(pdf_api_url=pdf_api.url),
+                max_concurrent_jobs=max_concurrent_jobs,
+                job_fetcher=leasing_job_fetcher,
+                poll_interval=poll_interval,
+                max_poll_interval=max_poll_interval,
+                prefetch_jobs=prefetch_jobs,
+                callback_port=0 if push else None,
+                **(worker_options or {}),
+            )
+            await worker.start()
+            pool.append(worker)
+        manager.request_counts.clear()
+
+        started = time.monotonic()
+        async with aiohttp.ClientSession() as session:
+            for index in range(jobs):
+                body = {
+                    "job_type": {
+                        "WebApiJob": {
+                            "url": pdf_api.url,
+                            "method": "POST",
+                            "headers": {"Content-Type": "application/json"},
+                            "body": json.dumps({"report_id": f"load-{index}"}),
+                            "timeout": 60,
+                        }
+                    }
+                }
+                enqueued = time.monotonic()
+                async with session.post(f"{manager.url}/jobs", json=body) as response:
+                    response.raise_for_status()
+                    created = await response.json()
+                submitted_at[created["job_id"]] = enqueued
+                if arrival_rate:
+                    await asyncio.sleep(rng.expovariate(arrival_rate))
+
+        await manager.wait_until_finished(jobs, timeout=timeout)
+        duration = time.monotonic() - started
+    finally:
+        for worker in pool:
+            await worker.stop()
+        await manager.stop()
+        await pdf_api.stop()
+
+    latencies = [
+        manager.finished_at[job_id] - enqueued
+        for job_id, enqueued in submitted_at.items()
+        if job_id in manager.finished_at
+    ]
+    statuses = [manager.jobs[job_id]["status"] for job_id in submitted_at]
+    return LoadTestReport(
+        workers=workers,
+        jobs=jobs,
+        completed=statuses.count("Completed"),
+        failed=len(statuses) - statuses.count("Completed"),
+        duration_seconds=duration,
+        jobs_per_second=len(latencies) / duration if duration > 0 else 0.0,
+        latency_p50=percentile(latencies, 50),
+        latency_p95=percentile(latencies, 95),
+        latency_p99=percentile(latencies, 99),
+        latency_max=max(latencies, default=0.0),
+        pdf_api_requests=pdf_api.requests,
+        pdf_api_peak_in_flight=pdf_api.peak_in_flight,
+        control_plane_requests=dict(manager.request_counts),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load-test PdfJobWorker against a local Job Manager.")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--max-concurrent-jobs", type=int, default=4)
+    parser.add_argument("--service-time", type=float, default=0.05, help="Mean PDF API service time (s)")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="exponential")
+    parser.add_argument("--jm-latency", type=float, default=0.0, help="Latency injected per Job Manager request (s)")
+    parser.add_argument("--arrival-rate", type=float, default=None, help="Jobs/s; default submits all at once")
+    parser.add_argument("--poll-interval", type=float, default=0.05)
+    parser.add_argument("--max-poll-interval", type=float, default=1.0)
+    parser.add_argument("--prefetch", type=int, default=1)
+    parser.add_argument("--push", action="store_true", help="Deliver jobs to worker callback listeners")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(
+        run_load_test(
+            workers=args.workers,
+            jobs=args.jobs,
+            max_concurrent_jobs=args.max_concurrent_jobs,
+            service_time=args.service_time,
+            distribution=args.distribution,
+            jm_latency=args.jm_latency,
+            arrival_rate=args.arrival_rate,
+            poll_interval=args.poll_interval,
+            max_poll_interval=args.max_poll_interval,
+            prefetch_jobs=args.prefetch,
+            push=args.push,
+            timeout=args.timeout,
+            seed=args.seed,
+        )
+    )
+    print(json.dumps(report.as_dict(), indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
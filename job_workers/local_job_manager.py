@@ -0,0 +1,537 @@
+"""In-process stand-in for the Job Manager described in ``job-manager_api_2025-11-12.json``.
+
+Besides the documented endpoints it accepts the worker's ``POST /jobs/{id}/result``
+submissions and offers ``POST /workers/{id}/lease`` so workers can pull queued jobs
+(see ``leasing_job_fetcher``). Workers that register with a ``callback_url`` have jobs
+pushed to them instead; a 429 answer leaves the job queued until the worker reports
+free capacity. Intended for offline benchmarks and CI, not production.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Union
+
+import aiohttp
+from aiohttp import web
+
+from .http_pool import bound_port
+from .scheduling import PRIORITY_RANKS, job_priority
+
+
+logger = logging.getLogger(__name__)
+
+
+LatencySource = Union[float, Callable[[], float]]
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class LocalJobManager:
+    """aiohttp Job Manager with a priority queue, job leasing and injected latency."""
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        base_path: str = "/api/v1/jobs",
+        latency: LatencySource = 0.0,
+        lease_timeout: float = 60.0,
+        worker_timeout: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            host: Interface to bind.
+            port: Port to bind; ``0`` picks a free port (see ``url`` after ``start``).
+            base_path: Prefix under which the spec paths are served.
+            latency: Seconds added to every request, or a callable returning them.
+            lease_timeout: Seconds a leased job may run before it is requeued.
+            worker_timeout: Seconds without a heartbeat after which a worker is offline.
+        """
+        self.host = host
+        self.port = port
+        self.base_path = "/" + base_path.strip("/") if base_path.strip("/") else ""
+        self.latency = latency
+        self.lease_timeout = lease_timeout
+        self.worker_timeout = worker_timeout
+
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.workers: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Counter = Counter()
+        self.finished_at: Dict[str, float] = {}
+        self._queues: Dict[int, Deque[str]] = {rank: deque() for rank in PRIORITY_RANKS.values()}
+        self._leases: Dict[str, float] = {}
+        self._job_finished = asyncio.Event()
+        self._dispatch_wanted = asyncio.Event()
+        self._push_cursor = itertools.count()
+        self._runner: Optional[web.AppRunner] = None
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._push_session: Optional[aiohttp.ClientSession] = None
+
+    # ------------------------------------------------------------------ lifecycle
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass as ``job_manager_url`` to ``PdfJobWorker``."""
+        return f"http://{self.host}:{self.bound_port}{self.base_path}"
+
+    @property
+    def bound_port(self) -> int:
+        port = bound_port(self._runner)
+        return port if port is not None else self.port
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._latency_middleware])
+        prefix = self.base_path
+        app.router.add_get(f"{prefix}/health", self.handle_health)
+        app.router.add_post(f"{prefix}/jobs", self.handle_create_job)
+        app.router.add_get(f"{prefix}/jobs/{{id}}", self.handle_get_job)
+        app.router.add_get(f"{prefix}/jobs/{{id}}/result", self.handle_get_result)
+        app.router.add_post(f"{prefix}/jobs/{{id}}/result", self.handle_submit_result)
+        app.router.add_get(f"{prefix}/workers", self.handle_list_workers)
+        app.router.add_post(f"{prefix}/workers", self.handle_register_worker)
+        app.router.add_post(f"{prefix}/workers/{{id}}", self.handle_update_load)
+        app.router.add_post(f"{prefix}/workers/{{id}}/lease", self.handle_lease)
+        return app
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._reaper_task = asyncio.create_task(self._reap_leases(), name="local-job-manager-leases")
+        self._push_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        self._dispatch_task = asyncio.create_task(self._dispatch_loop(), name="local-job-manager-push")
+        logger.info("Local Job Manager listening on %s", self.url)
+
+    async def stop(self) -> None:
+        for task in (self._reaper_task, self._dispatch_task):
+            if task is not None:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._reaper_task = None
+        self._dispatch_task = None
+        if self._push_session is not None:
+            await self._push_session.close()
+            self._push_session = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ------------------------------------------------------------------ queue API
+
+    def enqueue(
+        self,
+        job_type: Dict[str, Any],
+        *,
+        priority: Optional[str] = None,
+        max_retries: Optional[int] = None,
+        callback_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Create a Pending job directly (what ``POST /jobs`` does)."""
+        job_id = str(uuid.uuid4())
+        job = {
+            "id": job_id,
+            "job_type": job_type,
+            "status": "Pending",
+            "priority": priority if priority in PRIORITY_RANKS else "Normal",
+            "created_at": _now(),
+            "started_at": None,
+            "completed_at": None,
+            "retry_count": 0,
+            "worker_id": None,
+            "max_retries": max_retries or 0,
+            "callback_url": callback_url,
+        }
+        self.jobs[job_id] = job
+        self._queue(job)
+        return job
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Hand the highest-priority pending job to ``worker_id``."""
+        for rank in sorted(self._queues, reverse=True):
+            queue = self._queues[rank]
+            while queue:
+                job = self.jobs.get(queue.popleft())
+                if job is None or job["status"] != "Pending":
+                    continue
+                job["status"] = "Running"
+                job["worker_id"] = worker_id
+                job["started_at"] = _now()
+                self._leases[job["id"]] = time.monotonic() + self.lease_timeout
+                return job
+        return None
+
+    def pending_count(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def finished_count(self) -> int:
+        return len(self.finished_at)
+
+    async def wait_until_finished(self, count: int, timeout: Optional[float] = None) -> None:
+        """Wait until at least ``count`` jobs reached a terminal status."""
+
+        async def wait() -> None:
+            while self.finished_count() < count:
+                self._job_finished.clear()
+                await self._job_finished.wait()
+
+        await asyncio.wait_for(wait(), timeout=timeout)
+
+    def _queue(self, job: Dict[str, Any]) -> None:
+        self._queues[job_priority(job)].append(job["id"])
+        self._dispatch_wanted.set()
+
+    def _unlease(self, job: Dict[str, Any]) -> None:
+        """Return a job whose push was refused to the head of its queue."""
+        self._leases.pop(job["id"], None)
+        job["status"] = "Pending"
+        job["worker_id"] = None
+        job["started_at"] = None
+        self._queues[job_priority(job)].appendleft(job["id"])
+
+    def _requeue_or_fail(self, job: Dict[str, Any], status: str) -> None:
+        self._leases.pop(job["id"], None)
+        if job["retry_count"] < job["max_retries"]:
+            job["retry_count"] += 1
+            job["status"] = "Pending"
+            job["worker_id"] = None
+            job["started_at"] = None
+            self._queue(job)
+        else:
+            job["status"] = status
+            job["completed_at"] = _now()
+            self._mark_finished(job)
+
+    def _mark_finished(self, job: Dict[str, Any]) -> None:
+        self.finished_at[job["id"]] = time.monotonic()
+        self._job_finished.set()
+
+    def _push_targets(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        targets = [
+            worker
+            for worker in self.workers.values()
+            if worker.get("callback_url") and worker.get("push_blocked_until", 0.0) <= now
+        ]
+        if targets:
+            offset = next(self._push_cursor) % len(targets)
+            targets = targets[offset:] + targets[:offset]
+        return targets
+
+    async def _push_pending(self) -> None:
+        """Push queued jobs to callback workers until they are all full or the queue is empty."""
+        while True:
+            targets = self._push_targets()
+            if not targets:
+                return
+            pushed = False
+            for worker in targets:
+                job = self.lease(worker["id"])
+                if job is None:
+                    return
+                if await self._push(worker, job):
+                    pushed = True
+                else:
+                    self._unlease(job)
+            if not pushed:
+                return
+
+    async def _push(self, worker: Dict[str, Any], job: Dict[str, Any]) -> bool:
+        assert self._push_session is not None
+        self.request_counts["PUSH callback_url"] += 1
+        retry_after = 1.0
+        try:
+            async with self._push_session.post(worker["callback_url"], json=_lease_payload(job)) as response:
+                if response.status in (200, 202):
+                    return True
+                retry_after = float(response.headers.get("Retry-After", retry_after))
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+            logger.warning("Pushing job %s to %s failed: %s", job["id"], worker["id"], exc)
+        worker["push_blocked_until"] = time.monotonic() + retry_after
+        return False
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            self._dispatch_wanted.clear()
+            await self._push_pending()
+            # Blocked workers are retried after their Retry-After even without new events.
+            timeout = 0.5 if self.pending_count() and self._has_callback_workers() else None
+            try:
+                await asyncio.wait_for(self._dispatch_wanted.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _has_callback_workers(self) -> bool:
+        return any(worker.get("callback_url") for worker in self.workers.values())
+
+    def _unblock_push(self, worker_id: Optional[str]) -> None:
+        worker = self.workers.get(worker_id) if worker_id else None
+        if worker is not None and worker.get("callback_url"):
+            worker["push_blocked_until"] = 0.0
+            self._dispatch_wanted.set()
+
+    async def _reap_leases(self) -> None:
+        interval = max(min(self.lease_timeout / 4, 5.0), 0.05)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            for job_id, expires_at in list(self._leases.items()):
+                job = self.jobs.get(job_id)
+                if expires_at <= now and job is not None and job["status"] == "Running":
+                    logger.warning("Lease for job %s expired", job_id)
+                    self._requeue_or_fail(job, "Timeout")
+
+    # ------------------------------------------------------------------ HTTP handlers
+
+    @web.middleware
+    async def _latency_middleware(self, request: web.Request, handler: Callable) -> web.StreamResponse:
+        resource = request.match_info.route.resource
+        route = resource.canonical if resource is not None else request.path
+        if self.base_path and route.startswith(self.base_path):
+            route = route[len(self.base_path):]
+        self.request_counts[f"{request.method} {route}"] += 1
+        delay = self.latency() if callable(self.latency) else self.latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await handler(request)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "status": "healthy",
+                "pending_jobs": self.pending_count(),
+                "workers": len(self.workers),
+                "timestamp": _now(),
+            }
+        )
+
+    async def handle_create_job(self, request: web.Request) -> web.Response:
+        payload = await _json_object(request)
+        if payload is None:
+            return _invalid_body()
+        if not isinstance(payload.get("job_type"), dict):
+            return web.json_response({"error": "job_type is required"}, status=400)
+        job = self.enqueue(
+            payload["job_type"],
+            priority=payload.get("priority"),
+            max_retries=payload.get("max_retries"),
+            callback_url=payload.get("callback_url"),
+        )
+        return web.json_response(
+            {"job_id": job["id"], "status": job["status"], "created_at": job["created_at"]}
+        )
+
+    async def handle_get_job(self, request: web.Request) -> web.Response:
+        job = self.jobs.get(request.match_info["id"])
+        if job is None:
+            return web.json_response({"error": "job not found"}, status=404)
+        return web.json_response(_job_info(job))
+
+    async def handle_get_result(self, request: web.Request) -> web.Response:
+        result = self.results.get(request.match_info["id"])
+        if result is None:
+            return web.json_response({"error": "result not found"}, status=404)
+        return web.json_response(result)
+
+    async def handle_submit_result(self, request: web.Request) -> web.Response:
+        job = self.jobs.get(request.match_info["id"])
+        if job is None:
+            return web.json_response({"error": "job not found"}, status=404)
+        payload = await _json_object(request)
+        if payload is None:
+            return _invalid_body()
+        status = payload.get("status") or ("Completed" if payload.get("error") is None else "Failed")
+        self._leases.pop(job["id"], None)
+        self._unblock_push(job["worker_id"])
+
+        if status == "Failed" and job["retry_count"] < job["max_retries"]:
+            self._requeue_or_fail(job, "Failed")
+            return web.json_response({"job_id": job["id"], "status": job["status"]})
+
+        job["status"] = status
+        job["completed_at"] = payload.get("completed_at") or _now()
+        self.results[job["id"]] = {
+            "job_id": job["id"],
+            "status": status,
+            "result": payload.get("result"),
+            "error": payload.get("error"),
+            "execution_time_ms": payload.get("execution_time_ms"),
+            "completed_at": job["completed_at"],
+        }
+        self._mark_finished(job)
+        return web.json_response({"job_id": job["id"], "status": status})
+
+    async def handle_list_workers(self, request: web.Request) -> web.Response:
+        return web.json_response([self._worker_info(worker) for worker in self.workers.values()])
+
+    async def handle_register_worker(self, request: web.Request) -> web.Response:
+        payload = await _json_object(request)
+        if payload is None:
+            return _invalid_body()
+        worker_id = payload.get("id")
+        if not worker_id:
+            return web.json_response({"error": "id is required"}, status=400)
+        registered_at = _now()
+        self.workers[worker_id] = {
+            "id": worker_id,
+            "worker_type": payload.get("worker_type", "WebApi"),
+            "max_concurrent_jobs": int(payload.get("max_concurrent_jobs") or 0),
+            "supported_job_types": payload.get("supported_job_types") or [],
+            "current_jobs": 0,
+            "cpu_usage": 0.0,
+            "memory_usage": 0.0,
+            "last_heartbeat": registered_at,
+            "last_seen": time.monotonic(),
+            "callback_url": payload.get("callback_url"),
+        }
+        self._unblock_push(worker_id)
+        return web.json_response({"worker_id": worker_id, "registered_at": registered_at})
+
+    async def handle_update_load(self, request: web.Request) -> web.Response:
+        worker = self.workers.get(request.match_info["id"])
+        if worker is None:
+            return web.json_response({"error": "worker not registered"}, status=404)
+        payload = await _json_object(request)
+        if payload is None:
+            return _invalid_body()
+        for key in ("current_jobs", "cpu_usage", "memory_usage", "open_circuits"):
+            if key in payload:
+                worker[key] = payload[key]
+        worker["last_heartbeat"] = _now()
+        worker["last_seen"] = time.monotonic()
+        if worker["current_jobs"] < worker["max_concurrent_jobs"]:
+            self._unblock_push(worker["id"])
+        return web.json_response({"worker_id": worker["id"]})
+
+    async def handle_lease(self, request: web.Request) -> web.Response:
+        worker_id = request.match_info["id"]
+        worker = self.workers.get(worker_id)
+        if worker is not None:
+            worker["last_seen"] = time.monotonic()
+        job = self.lease(worker_id)
+        if job is None:
+            return web.Response(status=204)
+        return web.json_response(_lease_payload(job))
+
+    def _worker_info(self, worker: Dict[str, Any]) -> Dict[str, Any]:
+        max_jobs = worker["max_concurrent_jobs"]
+        info = {
+            key: worker[key]
+            for key in (
+                "id",
+                "worker_type",
+                "max_concurrent_jobs",
+                "current_jobs",
+                "cpu_usage",
+                "memory_usage",
+                "last_heartbeat",
+            )
+        }
+        info["is_online"] = time.monotonic() - worker["last_seen"] <= self.worker_timeout
+        info["load_ratio"] = worker["current_jobs"] / max_jobs if max_jobs else 0.0
+        return info
+
+
+async def _json_object(request: web.Request) -> Optional[Dict[str, Any]]:
+    """The request body as a JSON object, or ``None`` when it is not one."""
+    try:
+        payload = await request.json()
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _invalid_body() -> web.Response:
+    return web.json_response({"error": "request body must be a JSON object"}, status=400)
+
+
+def _job_info(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: job[key]
+        for key in (
+            "id",
+            "job_type",
+            "status",
+            "priority",
+            "created_at",
+            "started_at",
+            "completed_at",
+            "retry_count",
+            "worker_id",
+        )
+    }
+
+
+def _lease_payload(job: Dict[str, Any]) -> Dict[str, Any]:
+    payload = _job_info(job)
+    payload["max_retries"] = job["max_retries"]
+    payload["callback_url"] = job["callback_url"]
+    return payload
+
+
+async def leasing_job_fetcher(worker: Any) -> Optional[Dict[str, Any]]:
+    """``job_fetcher`` for ``PdfJobWorker`` pulling work from ``POST /workers/{id}/lease``."""
+    session = worker._job_session
+    if session is None:
+        return None
+    url = f"{worker.job_manager_url}/workers/{worker.worker_id}/lease"
+    async with session.post(url) as response:
+        if response.status == 200:
+            return await response.json()
+        if response.status != 204:
+            logger.debug("Lease request returned %s", response.status)
+        return None
+
+
+def exponential_latency(mean: float) -> Callable[[], float]:
+    """Latency source drawing from an exponential distribution with the given mean."""
+    return lambda: random.expovariate(1.0 / mean) if mean > 0 else 0.0
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    manager = LocalJobManager(
+        host=args.host,
+        port=args.port,
+        base_path=args.base_path,
+        latency=exponential_latency(args.latency) if args.latency_distribution == "exponential" else args.latency,
+        lease_timeout=args.lease_timeout,
+    )
+    await manager.start()
+    print(f"Local Job Manager listening on {manager.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await manager.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in Job Manager.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--base-path", default="/api/v1/jobs")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each request")
+    parser.add_argument("--latency-distribution", choices=("fixed", "exponential"), default="fixed")
+    parser.add_argument("--lease-timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
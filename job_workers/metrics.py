@@ -0,0 +1,284 @@
+import bisect
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from .http_pool import bound_port
+
+
+logger = logging.getLogger(__name__)
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing value, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, labels: Optional[Dict[str, str]] = None) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def samples(self) -> List[str]:
+        try:
+            value = float(self.read())
+        except Exception as exc:
+            logger.debug("Gauge %s failed: %s", self.name, exc)
+            return []
+        return [f"{self.name} {_format_value(value)}"]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition layout."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            totals[0] += value
+
+    def declare(self, labels: Optional[Dict[str, str]] = None) -> None:
+        """Create an empty series so it is exported before its first observation."""
+        with self._lock:
+            self._series.setdefault(_label_key(labels), ([0] * (len(self.buckets) + 1), [0.0]))
+
+    def count(self, labels: Optional[Dict[str, str]] = None) -> int:
+        series = self._series.get(_label_key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> List[str]:
+        lines: List[str] = []
+        for key, (counts, totals) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(totals[0])}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, help_text, read))
+
+    def histogram(
+        self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, buckets))
+
+    def _register(self, metric):  # type: ignore[no-untyped-def]
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.help_text}")  # type: ignore[attr-defined]
+            lines.append(f"# TYPE {name} {metric.kind}")  # type: ignore[attr-defined]
+            lines.extend(metric.samples())  # type: ignore[attr-defined]
+        return "\n".join(lines) + "\n"
+
+
+def merge_expositions(expositions: Dict[str, str], label: str = "worker_id") -> str:
+    """Merge Prometheus text expositions, tagging each sample with ``label``.
+
+    ``expositions`` maps label values (e.g. worker ids) to scraped ``/metrics`` bodies.
+    Samples of one metric family are grouped together, as the text format requires.
+    """
+    families: Dict[str, List[str]] = {}
+    headers: Dict[str, List[str]] = {}
+    for value, text in expositions.items():
+        family = ""
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            if line.startswith("#"):
+                parts = line.split(None, 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family = parts[2]
+                    families.setdefault(family, [])
+                    family_headers = headers.setdefault(family, [])
+                    if len(family_headers) < 2 and line not in family_headers:
+                        family_headers.append(line)
+                continue
+            name_end = len(line.split("{", 1)[0].split(" ", 1)[0])
+            tag = f'{label}="{_escape(value)}"'
+            if line[name_end:].startswith("{"):
+                rest = line[name_end + 1:]
+                separator = "" if rest.startswith("}") else ","
+                line = f"{line[:name_end]}{{{tag}{separator}{rest}"
+            else:
+                line = f"{line[:name_end]}{{{tag}}}{line[name_end:]}"
+            families.setdefault(family, []).append(line)
+
+    lines: List[str] = []
+    for family, samples in families.items():
+        lines.extend(headers.get(family, []))
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+class WorkerMetrics:
+    """Per-phase latency histograms and job counters of a ``PdfJobWorker``."""
+
+    PHASES = ("queue_wait", "pdf_api", "response_read", "render", "result_submit", "total")
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self.phase_seconds = self.registry.histogram(
+            "pdf_worker_phase_seconds", "Time spent per job phase in seconds."
+        )
+        for phase in self.PHASES:
+            self.phase_seconds.declare({"phase": phase})
+        self.jobs = self.registry.counter(
+            "pdf_worker_jobs_total", "Jobs finished by this worker, by status."
+        )
+        self.retries = self.registry.counter(
+            "pdf_worker_pdf_api_retries_total", "PDF API attempts retried after a failure."
+        )
+        self.response_bytes = self.registry.counter(
+            "pdf_worker_response_bytes_total", "Bytes read from PDF API responses."
+        )
+        self.result_bytes = self.registry.counter(
+            "pdf_worker_result_payload_bytes_total", "Encoded result payload bytes sent to the Job Manager."
+        )
+        self.result_submissions = self.registry.counter(
+            "pdf_worker_result_submissions_total", "Result submissions to the Job Manager, by outcome."
+        )
+        self.pushed_jobs = self.registry.counter(
+            "pdf_worker_pushed_jobs_total", "Jobs pushed to the callback listener, by outcome."
+        )
+        self.admission_refusals = self.registry.counter(
+            "pdf_worker_admission_refusals_total", "Job starts deferred by the memory budget."
+        )
+        self.cache_lookups = self.registry.counter(
+            "pdf_worker_result_cache_lookups_total", "Result cache lookups, by outcome."
+        )
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        if phase not in self.PHASES:
+            raise ValueError(f"Unknown phase {phase!r}; expected one of {self.PHASES}")
+        self.phase_seconds.observe(seconds, {"phase": phase})
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsServer:
+    """Tiny aiohttp server exposing ``/metrics`` in Prometheus text format."""
+
+    def __init__(self, registry: MetricsRegistry, *, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def bound_port(self) -> Optional[int]:
+        return bound_port(self._runner)
+
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info("Metrics endpoint listening on %s:%s", self.host, self.bound_port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
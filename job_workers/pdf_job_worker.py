@@ -1,14 +1,38 @@
 import asyncio
-import json
+import hashlib
 import logging
+import os
+import ssl
+import tempfile
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Awaitable, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 import aiohttp
 
+from .admission import MemoryAdmission
+from .callback import JobCallbackServer
+from .fetcher import JobBuffer, PrefetchingFetcher
+from .http_pool import ConnectionStats, build_connector, trace_config
+from .load_reporter import LoadReporter
+from .load_sampler import LoadSampler, default_load_sampler
+from .metrics import MetricsServer, WorkerMetrics
+from .render_pool import RenderPool
+from .renderers import RendererRegistry, default_registry
+from .result_cache import ResultCache, cache_key
+from .result_queue import PendingResult, ResultSubmitter
+from .retry import (
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    PdfApiStatusError,
+    RetryPolicy,
+)
+from .scheduling import PriorityJobBuffer
+from .serialization import JSON_CONTENT_TYPE, dumps, dumps_text, loads_body, project
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +42,16 @@ JobFetcher = Callable[["PdfJobWorker"], Awaitable[Optional[Dict[str, Any]]]]
 
 @dataclass
 class WorkerConfig:
-    """Configuration payload used during worker registration."""
+    """Configuration payload used during worker registration.
+
+    ``connection_pool_size`` caps connections to the PDF API host and defaults to the
+    worker's ``max_concurrent_jobs``. ``keepalive_timeout`` and ``dns_cache_ttl`` (``None``
+    disables the DNS cache) tune the pooled connectors shared by all jobs.
+
+    ``result_fields`` projects each job's response onto dotted paths (for example
+    ``("status_code", "pdf_url", "size_bytes")``) before it is submitted, so large PDF API
+    bodies and headers are not shipped back to the Job Manager. ``None`` keeps everything.
+    """
 
     pdf_api_url: str
     pdf_api_method: str = "POST"
@@ -26,6 +59,19 @@ class WorkerConfig:
         default_factory=lambda: {"Content-Type": "application/json"}
     )
     pdf_api_timeout: int = 120
+    output_dir: Optional[str] = None
+    response_chunk_size: int = 64 * 1024
+    max_response_bytes: Optional[int] = 200 * 1024 * 1024
+    kept_response_headers: Tuple[str, ...] = (
+        "Content-Type",
+        "Content-Length",
+        "Content-Disposition",
+        "ETag",
+    )
+    connection_pool_size: Optional[int] = None
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: Optional[int] = 300
+    result_fields: Optional[Tuple[str, ...]] = None
 
 
 class PdfJobWorker:
@@ -42,6 +88,26 @@ class PdfJobWorker:
         job_fetcher: Optional[JobFetcher] = None,
         heartbeat_interval: int = 10,
         poll_interval: float = 2.0,
+        load_sampler: Optional[LoadSampler] = None,
+        load_report_interval: float = 1.0,
+        renderers: Optional[RendererRegistry] = None,
+        render_pool: Optional[RenderPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        result_queue_size: int = 1000,
+        result_submit_concurrency: int = 4,
+        result_spool_path: Optional[str] = None,
+        prefetch_jobs: int = 1,
+        max_poll_interval: float = 5.0,
+        priority_aging_interval: Optional[float] = 30.0,
+        metrics: Optional[WorkerMetrics] = None,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = "127.0.0.1",
+        result_cache: Optional[ResultCache] = None,
+        callback_port: Optional[int] = None,
+        callback_host: str = "127.0.0.1",
+        callback_url: Optional[str] = None,
+        memory_admission: Optional[MemoryAdmission] = None,
     ) -> None:
         """
         Args:
@@ -51,8 +117,49 @@ class PdfJobWorker:
             worker_config: PDF API configuration describing the default WebApiJob payload.
             job_manager_headers: Optional HTTP headers required by the Job Manager (auth, tenant, etc.).
             job_fetcher: Coroutine returning the next job payload to execute. Defaults to no-op.
-            heartbeat_interval: Interval (seconds) between heartbeat/load updates.
-            poll_interval: Interval (seconds) used when no jobs are available.
+            heartbeat_interval: Maximum interval (seconds) between heartbeat/load updates.
+            poll_interval: Initial interval (seconds) used when no jobs are available.
+            load_sampler: Callable returning a ``LoadSample`` for load reports. Defaults to
+                a ``/proc`` based sampler when available.
+            load_report_interval: Minimum interval (seconds) between coalesced load updates
+                triggered by job start/finish. Filling up is reported at once, other
+                changes between idle, busy and full once they last 0.1s.
+            renderers: Registry of in-process renderers executed for ``RustJob`` payloads.
+                Defaults to the module-level registry, which is empty unless renderer
+                modules such as ``job_workers.roy_renderer`` were imported. ``RustJob`` is
+                only advertised at registration for registered renderers.
+            render_pool: Optional process pool used to run ``RustJob`` renderers. Without it
+                renderers run on the default thread pool of the event loop.
+            retry_policy: Backoff used when retrying transient PDF API failures. A job's own
+                ``max_retries`` overrides ``retry_policy.max_retries``.
+            circuit_breakers: Per-endpoint circuit breakers guarding the PDF API.
+            result_queue_size: Capacity of the background result submission queue.
+            result_submit_concurrency: Number of results submitted to the Job Manager in parallel.
+            result_spool_path: JSON lines file persisting results not submitted before ``stop``.
+            prefetch_jobs: Number of jobs fetched ahead of the free execution slots. Priority
+                scheduling only reorders these buffered jobs, so a deeper prefetch gives it
+                more to choose from at the cost of leasing more jobs than the worker runs.
+            max_poll_interval: Upper bound (seconds) of the exponential idle poll backoff,
+                i.e. how late an idle worker may pick up a new job. Raising it lowers the
+                idle polling load on the Job Manager; push delivery (``callback_port``)
+                removes the delay altogether.
+            priority_aging_interval: Seconds of waiting that raise a buffered job by one
+                ``JobPriority`` level. ``None`` disables priority scheduling (plain FIFO).
+            metrics: Per-phase timers and counters; a fresh ``WorkerMetrics`` by default.
+            metrics_port: When set, serve ``/metrics`` in Prometheus text format on this port
+                (``0`` picks a free port).
+            metrics_host: Interface the metrics endpoint binds to.
+            result_cache: Optional cache of successful ``WebApiJob`` results keyed by the
+                normalised method, URL and body; a hit skips the PDF API call.
+            callback_port: When set, listen on this port (``0`` picks a free port) for jobs
+                pushed by the Job Manager to ``POST /jobs``. Pushes beyond the free slots
+                plus the prefetch depth are rejected with 429; polling continues as a fallback.
+            callback_host: Interface the callback listener binds to.
+            callback_url: URL advertised to the Job Manager at registration; defaults to
+                the listener's own address.
+            memory_admission: Optional RSS budget. Jobs whose projected memory does not fit
+                wait (and the worker reports itself full) until running jobs finish. Use
+                ``process_tree_rss(render_pool.pids)`` as its reader with a render pool.
         """
         self.worker_id = worker_id or f"pdf-worker-{uuid.uuid4().hex[:8]}"
         self.job_manager_url = job_manager_url.rstrip("/")
@@ -62,13 +169,92 @@ class PdfJobWorker:
         self.job_fetcher = job_fetcher
         self.heartbeat_interval = heartbeat_interval
         self.poll_interval = poll_interval
+        self.load_sampler = load_sampler or default_load_sampler()
+        self.renderers = renderers if renderers is not None else default_registry
+        self.render_pool = render_pool
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breakers = circuit_breakers or CircuitBreakerRegistry()
+        self.circuit_breakers.on_state_change = self._on_circuit_change
+        self.metrics = metrics or WorkerMetrics()
+        self.result_cache = result_cache
+        self.memory_admission = memory_admission
+        self._metrics_server = (
+            MetricsServer(self.metrics.registry, host=metrics_host, port=metrics_port)
+            if metrics_port is not None
+            else None
+        )
+        self._fetcher = PrefetchingFetcher(
+            self.fetch_next_job,
+            self._free_slots,
+            prefetch=prefetch_jobs,
+            poll_interval=poll_interval,
+            max_poll_interval=max_poll_interval,
+            buffer=(
+                PriorityJobBuffer(aging_interval=priority_aging_interval)
+                if priority_aging_interval is not None
+                else JobBuffer()
+            ),
+            on_dequeue=lambda _job, waited: self.metrics.observe_phase("queue_wait", waited),
+        )
+        self._fetcher_task: Optional[asyncio.Task] = None
+        self._callback_server = (
+            JobCallbackServer(self._accept_pushed_job, host=callback_host, port=callback_port)
+            if callback_port is not None
+            else None
+        )
+        self._callback_url = callback_url
+        self._held_job: Optional[Dict[str, Any]] = None
+        self._admission_task: Optional[asyncio.Task] = None
+        self._result_submitter = ResultSubmitter(
+            self._send_pending_result,
+            max_queue=result_queue_size,
+            concurrency=result_submit_concurrency,
+            spool_path=result_spool_path,
+        )
+        self._load_reporter = LoadReporter(
+            self._publish_load,
+            capacity=max_concurrent_jobs,
+            min_interval=load_report_interval,
+            heartbeat_interval=heartbeat_interval,
+        )
 
         self._job_session: Optional[aiohttp.ClientSession] = None
         self._http_session: Optional[aiohttp.ClientSession] = None
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self.connection_stats: Dict[str, ConnectionStats] = {
+            "job_manager": ConnectionStats(),
+            "pdf_api": ConnectionStats(),
+        }
         self._current_jobs: int = 0
         self._running: bool = False
+        self._draining: bool = False
+        self._register_gauges()
         self._heartbeat_task: Optional[asyncio.Task] = None
         self._job_loop_task: Optional[asyncio.Task] = None
+        self._job_tasks: Set[asyncio.Task] = set()
+
+    def _register_gauges(self) -> None:
+        registry = self.metrics.registry
+        registry.gauge("pdf_worker_current_jobs", "Jobs currently executing.", lambda: self._current_jobs)
+        registry.gauge(
+            "pdf_worker_buffered_jobs", "Fetched jobs waiting for a slot.", lambda: len(self._fetcher.buffer)
+        )
+        registry.gauge(
+            "pdf_worker_pending_results",
+            "Results waiting to be submitted.",
+            self._result_submitter.pending,
+        )
+        for name, stats in self.connection_stats.items():
+            registry.gauge(
+                f"pdf_worker_{name}_connections_created",
+                f"Connections opened to the {name.replace('_', ' ')}.",
+                lambda stats=stats: stats.connections_created,
+            )
+            registry.gauge(
+                f"pdf_worker_{name}_connections_reused",
+                f"Pooled connections reused for the {name.replace('_', ' ')}.",
+                lambda stats=stats: stats.connections_reused,
+            )
 
     async def start(self) -> None:
         """Start the worker: register, open sessions, and launch background tasks."""
@@ -76,22 +262,51 @@ class PdfJobWorker:
             return
 
         await self._ensure_sessions()
+        if self._metrics_server is not None:
+            await self._metrics_server.start()
+        if self.render_pool is not None and not self.render_pool.started:
+            await asyncio.get_running_loop().run_in_executor(None, self.render_pool.start)
+        self._running = True
+        self._draining = False
+        if self._callback_server is not None:
+            await self._callback_server.start()
         await self.register()
 
-        self._running = True
+        await self._result_submitter.start()
         self._heartbeat_task = asyncio.create_task(self._heartbeat_loop(), name="pdf-worker-heartbeat")
+        self._fetcher_task = asyncio.create_task(self._fetcher.run(), name="pdf-worker-fetcher")
         self._job_loop_task = asyncio.create_task(self._job_loop(), name="pdf-worker-jobs")
+        if self.memory_admission is not None:
+            self._admission_task = asyncio.create_task(
+                self.memory_admission.run(), name="pdf-worker-memory"
+            )
         logger.info("Worker %s started", self.worker_id)
 
-    async def stop(self) -> None:
-        """Stop worker execution and cleanup resources."""
+    async def stop(self, *, drain: bool = False, drain_timeout: float = 60.0) -> None:
+        """Stop worker execution and cleanup resources.
+
+        Args:
+            drain: Stop fetching, advertise zero free capacity and let in-flight (and
+                already prefetched) jobs finish before shutting down.
+            drain_timeout: Seconds to wait for draining jobs before cancelling them.
+        """
         if not self._running:
             await self._close_sessions()
             return
 
+        if self._callback_server is not None:
+            await self._callback_server.stop()
+        if drain:
+            await self._drain(drain_timeout)
+
         self._running = False
 
-        for task in (self._heartbeat_task, self._job_loop_task):
+        for task in (
+            self._heartbeat_task,
+            self._fetcher_task,
+            self._job_loop_task,
+            self._admission_task,
+        ):
             if task:
                 task.cancel()
                 try:
@@ -101,17 +316,88 @@ class PdfJobWorker:
                 except Exception as exc:
                     logger.debug("Background task raised during shutdown: %s", exc)
 
+        await self._cancel_job_tasks()
+        abandoned = self._fetcher.drain()
+        if self._held_job is not None:
+            abandoned.append(self._held_job)
+            self._held_job = None
+        if abandoned:
+            logger.warning("Abandoning %s prefetched jobs on stop", len(abandoned))
+        await self._result_submitter.stop()
+        if self.render_pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.render_pool.shutdown)
+        if self._metrics_server is not None:
+            await self._metrics_server.stop()
         await self._close_sessions()
         logger.info("Worker %s stopped", self.worker_id)
 
+    async def _drain(self, timeout: float) -> None:
+        """Finish in-flight and prefetched jobs without accepting new ones."""
+        self._draining = True
+        if self._fetcher_task:
+            self._fetcher_task.cancel()
+            await asyncio.gather(self._fetcher_task, return_exceptions=True)
+            self._fetcher_task = None
+        await self._load_reporter.flush()
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            self._reap_job_tasks()
+            remaining = deadline - loop.time()
+            if not self._job_tasks and not len(self._fetcher.buffer) and self._held_job is None:
+                logger.info("Worker %s drained", self.worker_id)
+                return
+            if remaining <= 0:
+                logger.warning(
+                    "Drain deadline reached with %s jobs in flight and %s prefetched",
+                    self._active_jobs(),
+                    len(self._fetcher.buffer),
+                )
+                return
+            if self._job_tasks:
+                await asyncio.wait(
+                    self._job_tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+            else:
+                # Prefetched jobs are waiting for the job loop to pick them up.
+                await asyncio.sleep(min(0.01, remaining))
+
     async def _ensure_sessions(self) -> None:
+        config = self.worker_config or WorkerConfig(pdf_api_url="")
+        if self._ssl_context is None:
+            # One context for both pools so the CA store is loaded once. Python's ssl module
+            # does not resume client TLS sessions on its own, so each new connection still
+            # does a full handshake; keep-alive reuse is what avoids handshakes.
+            self._ssl_context = ssl.create_default_context()
         if self._job_session is None:
             timeout = aiohttp.ClientTimeout(total=60)
+            job_manager_limit = self._result_submitter.concurrency + 4
             self._job_session = aiohttp.ClientSession(
-                headers=self.job_manager_headers, timeout=timeout
+                headers=self.job_manager_headers,
+                timeout=timeout,
+                connector=build_connector(
+                    limit=job_manager_limit,
+                    limit_per_host=job_manager_limit,
+                    keepalive_timeout=config.keepalive_timeout,
+                    dns_cache_ttl=config.dns_cache_ttl,
+                    ssl_context=self._ssl_context,
+                ),
+                trace_configs=[trace_config(self.connection_stats["job_manager"])],
             )
         if self._http_session is None:
-            self._http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300))
+            pool_size = config.connection_pool_size or max(self.max_concurrent_jobs, 1)
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=300),
+                connector=build_connector(
+                    limit=pool_size * 2,
+                    limit_per_host=pool_size,
+                    keepalive_timeout=config.keepalive_timeout,
+                    dns_cache_ttl=config.dns_cache_ttl,
+                    ssl_context=self._ssl_context,
+                ),
+                trace_configs=[trace_config(self.connection_stats["pdf_api"])],
+            )
 
     async def _close_sessions(self) -> None:
         for session in (self._job_session, self._http_session):
@@ -121,35 +407,145 @@ class PdfJobWorker:
         self._http_session = None
 
     async def _heartbeat_loop(self) -> None:
-        """Periodically publish heartbeat/load information."""
+        """Publish heartbeat/load information through the coalescing load reporter."""
         try:
-            while self._running:
-                await self.update_load(
-                    current_jobs=self._current_jobs,
-                    cpu_usage=10.0 + self._current_jobs * 5.0,
-                    memory_usage=20.0 + self._current_jobs * 8.0,
-                )
-                await asyncio.sleep(self.heartbeat_interval)
+            await self._load_reporter.run()
         except asyncio.CancelledError:
             raise
         except Exception as exc:
             logger.error("Heartbeat loop encountered an error: %s", exc)
 
+    async def _publish_load(self) -> None:
+        """Sample real resource usage and report it together with the job count."""
+        try:
+            sample = self.load_sampler()
+        except Exception as exc:
+            logger.debug("Load sampling failed: %s", exc)
+            cpu_usage, memory_usage = 0.0, 0.0
+        else:
+            cpu_usage, memory_usage = sample.cpu_usage, sample.memory_usage
+        extra: Dict[str, Any] = {}
+        open_circuits = self.circuit_breakers.open_circuits()
+        if open_circuits:
+            extra["open_circuits"] = open_circuits
+        current_jobs = self._current_jobs
+        if self._draining or self._held_job is not None:
+            # Report a full worker so the Job Manager stops routing work here.
+            current_jobs = max(current_jobs, self.max_concurrent_jobs)
+        await self.update_load(
+            current_jobs=current_jobs,
+            cpu_usage=cpu_usage,
+            memory_usage=memory_usage,
+            **extra,
+        )
+
+    def _on_circuit_change(self, state: str) -> None:
+        logger.warning("PDF API circuit breaker is now %s", state)
+        self._load_reporter.mark_urgent()
+
     async def _job_loop(self) -> None:
-        """Continuously fetch and execute jobs."""
+        """Take prefetched jobs and run up to ``max_concurrent_jobs`` of them at once."""
         try:
             while self._running:
-                job_data = await self.fetch_next_job()
-                if not job_data:
-                    await asyncio.sleep(self.poll_interval)
+                self._reap_job_tasks()
+                if not self._has_capacity():
+                    await asyncio.wait(self._job_tasks, return_when=asyncio.FIRST_COMPLETED)
                     continue
 
-                await self._handle_job(job_data)
+                held = self._held_job
+                job_data = held or await self._fetcher.get()
+                if not self._admit(job_data):
+                    await self._wait_for_memory(job_data)
+                    continue
+                if held is not None:
+                    self._held_job = None
+                    self._load_reporter.mark_urgent()
+                self._spawn_job(job_data)
         except asyncio.CancelledError:
             raise
         except Exception as exc:
             logger.error("Job loop encountered an error: %s", exc)
 
+    def _active_jobs(self) -> int:
+        return sum(1 for task in self._job_tasks if not task.done())
+
+    def _free_slots(self) -> int:
+        """Slots offered to the fetcher; none while a job waits for memory."""
+        if self._held_job is not None:
+            return 0
+        return self._idle_slots()
+
+    def _idle_slots(self) -> int:
+        return max(self.max_concurrent_jobs, 1) - self._active_jobs()
+
+    def _has_capacity(self) -> bool:
+        return self._idle_slots() > 0
+
+    def _admit(self, job_data: Dict[str, Any]) -> bool:
+        if self.memory_admission is None:
+            return True
+        return self.memory_admission.try_admit(_job_id(job_data), job_data)
+
+    async def _wait_for_memory(self, job_data: Dict[str, Any]) -> None:
+        """Hold a job that does not fit the memory budget until a running job finishes."""
+        assert self.memory_admission is not None
+        newly_held = self._held_job is None
+        self._held_job = job_data
+        if newly_held:
+            self.metrics.admission_refusals.inc()
+            self._load_reporter.mark_urgent()
+        if self._job_tasks:
+            await asyncio.wait(
+                self._job_tasks,
+                timeout=self.memory_admission.sample_interval,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        else:
+            await asyncio.sleep(self.memory_admission.sample_interval)
+
+    @property
+    def callback_url(self) -> Optional[str]:
+        """URL the Job Manager should push jobs to, when the callback listener is enabled."""
+        if self._callback_server is None:
+            return None
+        return self._callback_url or self._callback_server.url
+
+    def _accept_pushed_job(self, job_data: Dict[str, Any]) -> bool:
+        """Buffer a job pushed to the callback listener unless the worker is full."""
+        if not self._running or self._draining or self._fetcher.wanted() <= 0:
+            self.metrics.pushed_jobs.inc(labels={"outcome": "rejected"})
+            return False
+        self._fetcher.put(job_data)
+        self.metrics.pushed_jobs.inc(labels={"outcome": "accepted"})
+        return True
+
+    def _spawn_job(self, job_data: Dict[str, Any]) -> asyncio.Task:
+        job_id = _job_id(job_data)
+        task = asyncio.create_task(self._handle_job(job_data), name=f"pdf-worker-job-{job_id}")
+        self._job_tasks.add(task)
+        task.add_done_callback(lambda _: self._on_job_done(job_id))
+        return task
+
+    def _on_job_done(self, job_id: str) -> None:
+        if self.memory_admission is not None:
+            self.memory_admission.release(job_id)
+        self._fetcher.notify_capacity()
+
+    def _reap_job_tasks(self) -> None:
+        """Drop finished job tasks, logging anything that escaped ``_handle_job``."""
+        for task in [t for t in self._job_tasks if t.done()]:
+            self._job_tasks.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                logger.error("Job task %s raised: %s", task.get_name(), task.exception())
+
+    async def _cancel_job_tasks(self) -> None:
+        tasks = list(self._job_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._job_tasks.clear()
+
     async def fetch_next_job(self) -> Optional[Dict[str, Any]]:
         """Obtain the next job payload to execute."""
         if self.job_fetcher is None:
@@ -163,10 +559,12 @@ class PdfJobWorker:
 
         payload = {
             "id": self.worker_id,
-            "worker_type": "WebApi",
+            "worker_type": "WebApi" if self.worker_config else "Rust",
             "max_concurrent_jobs": self.max_concurrent_jobs,
             "supported_job_types": [],
         }
+        if self.callback_url:
+            payload["callback_url"] = self.callback_url
 
         if self.worker_config:
             payload["supported_job_types"].append(
@@ -181,6 +579,11 @@ class PdfJobWorker:
                 }
             )
 
+        for module, function in self.renderers:
+            payload["supported_job_types"].append(
+                {"RustJob": {"module": module, "function": function, "params": None}}
+            )
+
         url = f"{self.job_manager_url}/workers"
 
         try:
@@ -197,18 +600,29 @@ class PdfJobWorker:
         return False
 
     async def update_load(
-        self, *, current_jobs: int, cpu_usage: float, memory_usage: float
+        self,
+        *,
+        current_jobs: int,
+        cpu_usage: float,
+        memory_usage: float,
+        open_circuits: Optional[List[str]] = None,
     ) -> None:
-        """Send current load metrics to the Job Manager."""
+        """Send current load metrics to the Job Manager.
+
+        ``open_circuits`` lists PDF API endpoints whose circuit breaker is not closed, so
+        the manager can shed load from this worker while its backend is failing.
+        """
         if self._job_session is None:
             return
 
         url = f"{self.job_manager_url}/workers/{self.worker_id}"
-        payload = {
+        payload: Dict[str, Any] = {
             "current_jobs": current_jobs,
             "cpu_usage": cpu_usage,
             "memory_usage": memory_usage,
         }
+        if open_circuits:
+            payload["open_circuits"] = open_circuits
 
         try:
             async with self._job_session.post(url, json=payload) as response:
@@ -227,26 +641,33 @@ class PdfJobWorker:
         result: Optional[Dict[str, Any]],
         error: Optional[str],
         execution_time_ms: Optional[int] = None,
-    ) -> None:
-        """Submit job execution result back to Job Manager."""
+    ) -> bool:
+        """Submit job execution result back to Job Manager; returns ``True`` when accepted."""
         if self._job_session is None:
-            return
+            return False
 
         url = f"{self.job_manager_url}/jobs/{job_id}/result"
+        # JobResult.result is a string in the spec, so the result is encoded once here and
+        # the envelope once below; aiohttp's own ``json=`` encoding is bypassed.
         payload: Dict[str, Any] = {
             "job_id": job_id,
             "status": "Completed" if error is None else "Failed",
-            "result": json.dumps(result) if result is not None else None,
+            "result": dumps_text(result) if result is not None else None,
             "error": error,
             "completed_at": datetime.now(timezone.utc).isoformat(),
         }
         if execution_time_ms is not None:
             payload["execution_time_ms"] = execution_time_ms
+        body = dumps(payload)
+        self.metrics.result_bytes.inc(len(body))
 
         try:
-            async with self._job_session.post(url, json=payload) as response:
+            async with self._job_session.post(
+                url, data=body, headers={"Content-Type": JSON_CONTENT_TYPE}
+            ) as response:
                 if response.status == 200:
                     logger.info("Submitted result for job %s", job_id)
+                    return True
                 else:
                     text = await response.text()
                     logger.error(
@@ -257,6 +678,50 @@ class PdfJobWorker:
                     )
         except Exception as exc:
             logger.error("Result submission error for job %s: %s", job_id, exc)
+        return False
+
+    async def _send_pending_result(self, item: PendingResult) -> bool:
+        return await self._timed_submit(
+            item.job_id,
+            result=item.result,
+            error=item.error,
+            execution_time_ms=item.execution_time_ms,
+        )
+
+    async def _timed_submit(
+        self,
+        job_id: str,
+        *,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+        execution_time_ms: Optional[int] = None,
+    ) -> bool:
+        started = time.perf_counter()
+        accepted = await self.submit_result(
+            job_id, result=result, error=error, execution_time_ms=execution_time_ms
+        )
+        self.metrics.observe_phase("result_submit", time.perf_counter() - started)
+        outcome = "rejected" if accepted is False else "accepted"
+        self.metrics.result_submissions.inc(labels={"outcome": outcome})
+        return accepted is not False
+
+    async def _deliver_result(
+        self,
+        job_id: str,
+        *,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+        execution_time_ms: Optional[int] = None,
+    ) -> None:
+        """Queue a result for background submission, or submit inline when not started."""
+        if self._result_submitter.running:
+            await self._result_submitter.put(
+                PendingResult(job_id, result, error, execution_time_ms)
+            )
+        else:
+            await self._timed_submit(
+                job_id, result=result, error=error, execution_time_ms=execution_time_ms
+            )
 
     async def execute_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
         """Dispatch execution based on the job type definition."""
@@ -264,42 +729,156 @@ class PdfJobWorker:
 
         if "WebApiJob" in job_type:
             return await self._execute_web_api_job(job_data, job_type["WebApiJob"])
+        if "RustJob" in job_type:
+            return await self._execute_local_job(job_data, job_type["RustJob"])
 
         raise ValueError(f"Unsupported job type in payload: {job_type!r}")
 
     async def _handle_job(self, job_data: Dict[str, Any]) -> None:
         """Execute a single job and submit its result."""
-        job_id = job_data.get("id") or uuid.uuid4().hex
+        job_id = _job_id(job_data)
         start_time = time.perf_counter()
         self._current_jobs += 1
-        await self.update_load(
-            current_jobs=self._current_jobs,
-            cpu_usage=10.0 + self._current_jobs * 5.0,
-            memory_usage=20.0 + self._current_jobs * 8.0,
-        )
+        self._load_reporter.record(self._current_jobs)
 
         try:
             execution_payload = await self.execute_job(job_data)
-            duration_ms = int((time.perf_counter() - start_time) * 1000)
-            await self.submit_result(
+            if self.worker_config is not None:
+                execution_payload = project(execution_payload, self.worker_config.result_fields)
+            elapsed = time.perf_counter() - start_time
+            duration_ms = int(elapsed * 1000)
+            self.metrics.observe_phase("total", elapsed)
+            self.metrics.jobs.inc(labels={"status": "completed"})
+            await self._deliver_result(
                 job_id,
                 result={
                     "worker_id": self.worker_id,
-                    "web_api_response": execution_payload,
+                    _result_key(job_data): execution_payload,
                 },
                 error=None,
                 execution_time_ms=duration_ms,
             )
         except Exception as exc:
             logger.exception("Job %s failed: %s", job_id, exc)
-            await self.submit_result(job_id, result=None, error=str(exc))
+            self.metrics.observe_phase("total", time.perf_counter() - start_time)
+            self.metrics.jobs.inc(labels={"status": "failed"})
+            await asyncio.to_thread(self._discard_outputs, job_id)
+            await self._deliver_result(job_id, result=None, error=str(exc))
+        except asyncio.CancelledError:
+            self._discard_outputs(job_id)
+            raise
         finally:
             self._current_jobs = max(self._current_jobs - 1, 0)
-            await self.update_load(
-                current_jobs=self._current_jobs,
-                cpu_usage=10.0 + self._current_jobs * 5.0,
-                memory_usage=20.0 + self._current_jobs * 8.0,
-            )
+            self._load_reporter.record(self._current_jobs)
+
+    async def _execute_local_job(
+        self, job_data: Dict[str, Any], local_job: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute a registered in-process renderer addressed by module/function."""
+        module = local_job.get("module", "")
+        function = local_job.get("function", "")
+        params = local_job.get("params")
+
+        started = time.perf_counter()
+        if self.render_pool is not None:
+            output = await self.render_pool.render(module, function, params)
+        else:
+            renderer = self.renderers.get(module, function)
+            loop = asyncio.get_running_loop()
+            output = await loop.run_in_executor(None, renderer, params)
+        self.metrics.observe_phase("render", time.perf_counter() - started)
+
+        if isinstance(output, (bytes, bytearray, memoryview)):
+            job_id = _job_id(job_data)
+            return await self._store_pdf(job_id, bytes(output))
+        return dict(output)
+
+    def _output_dir(self) -> str:
+        configured = self.worker_config.output_dir if self.worker_config else None
+        path = configured or os.path.join(tempfile.gettempdir(), "pdf-worker-output")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _output_path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self._output_dir(), f"{os.path.basename(job_id)}{suffix}")
+
+    def _discard_outputs(self, job_id: str) -> None:
+        """Remove whatever a failed job left in the output directory."""
+        for suffix in (".pdf", ".bin", ".pdf.part", ".bin.part"):
+            path = self._output_path(job_id, suffix)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logger.warning("Could not remove output %s: %s", path, exc)
+
+    async def _store_pdf(self, job_id: str, pdf_bytes: bytes) -> Dict[str, Any]:
+        """Write rendered PDF bytes to the output directory and describe the file."""
+        path = self._output_path(job_id, ".pdf")
+        sha256 = await asyncio.to_thread(_write_file, path, pdf_bytes)
+        return _file_descriptor(path, len(pdf_bytes), sha256)
+
+    async def _spool_response(
+        self, job_id: str, response: aiohttp.ClientResponse
+    ) -> Dict[str, Any]:
+        """Stream a binary response body to disk chunk by chunk, enforcing the size cap."""
+        chunk_size = self.worker_config.response_chunk_size if self.worker_config else 64 * 1024
+        limit = self.worker_config.max_response_bytes if self.worker_config else None
+        content_type = response.headers.get("Content-Type", "")
+        suffix = ".pdf" if "pdf" in content_type.lower() else ".bin"
+
+        path = self._output_path(job_id, suffix)
+        partial_path = f"{path}.part"
+        digest = hashlib.sha256()
+        size = 0
+        # File calls go through to_thread so a slow disk never stalls the event loop.
+        handle = await asyncio.to_thread(open, partial_path, "wb")
+        try:
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    size += len(chunk)
+                    if limit is not None and size > limit:
+                        raise ValueError(
+                            f"PDF API response exceeds max_response_bytes ({limit})"
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(handle.write, chunk)
+            finally:
+                await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(os.replace, partial_path, path)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+
+        descriptor = _file_descriptor(path, size, digest.hexdigest())
+        descriptor["content_type"] = content_type
+        return descriptor
+
+    async def _read_response(self, response: aiohttp.ClientResponse) -> bytes:
+        """Read an inline response body, enforcing the size cap even without Content-Length."""
+        limit = self.worker_config.max_response_bytes if self.worker_config else None
+        if limit is None:
+            return await response.read()
+        if (response.content_length or 0) > limit:
+            raise ValueError(f"PDF API response exceeds max_response_bytes ({limit})")
+
+        chunk_size = self.worker_config.response_chunk_size
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(chunk_size):
+            body += chunk
+            if len(body) > limit:
+                raise ValueError(f"PDF API response exceeds max_response_bytes ({limit})")
+        return bytes(body)
+
+    def _kept_headers(self, response: aiohttp.ClientResponse) -> Dict[str, str]:
+        names = (
+            self.worker_config.kept_response_headers
+            if self.worker_config
+            else WorkerConfig.kept_response_headers
+        )
+        return {name: response.headers[name] for name in names if name in response.headers}
 
     async def _execute_web_api_job(
         self, job_data: Dict[str, Any], web_api_job: Dict[str, Any]
@@ -321,38 +900,112 @@ class PdfJobWorker:
         )
 
         data: Optional[bytes] = None
-        json_payload: Optional[Any] = None
-
-        if isinstance(body, (dict, list)):
-            json_payload = body
-        elif isinstance(body, str):
+        if isinstance(body, str):
             data = body.encode("utf-8")
         elif body is not None:
-            json_payload = body
+            data = dumps(body)
+            if not any(name.lower() == "content-type" for name in headers):
+                headers = {**headers, "Content-Type": JSON_CONTENT_TYPE}
+
+        request_key: Optional[str] = None
+        if self.result_cache is not None:
+            request_key = cache_key(method, url, body)
+            cached = await self.result_cache.get(request_key)
+            self.metrics.cache_lookups.inc(labels={"outcome": "hit" if cached else "miss"})
+            if cached is not None:
+                cached["cache_hit"] = True
+                return cached
 
         timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        max_retries = job_data.get("max_retries")
+        if max_retries is None:
+            max_retries = self.retry_policy.max_retries
+        breaker = self.circuit_breakers.get(url)
+        job_id = _job_id(job_data)
+
+        last_error: Optional[BaseException] = None
+        for attempt in range(max_retries + 1):
+            if attempt:
+                self.metrics.retries.inc()
+                await asyncio.sleep(self.retry_policy.backoff(attempt - 1))
+            probe = breaker.state == CircuitBreaker.HALF_OPEN
+            if not breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {url}") from last_error
+            try:
+                result = await self._request_web_api(
+                    job_id, method, url, headers, data, timeout
+                )
+            except PdfApiStatusError as exc:
+                if exc.status != 429:
+                    breaker.record_failure()
+                last_error = exc
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                breaker.record_failure()
+                last_error = exc
+            else:
+                breaker.record_success()
+                if request_key is not None and 200 <= result["status_code"] < 300:
+                    await self.result_cache.put(request_key, result)  # type: ignore[union-attr]
+                result["attempts"] = attempt + 1
+                return result
+            finally:
+                # A throttled, cancelled or otherwise unrecorded half-open probe must not
+                # keep the breaker's single probe slot taken.
+                if probe:
+                    breaker.release()
+            logger.warning(
+                "PDF API attempt %s/%s for job %s failed: %r",
+                attempt + 1,
+                max_retries + 1,
+                job_id,
+                last_error,
+            )
 
+        assert last_error is not None
+        raise last_error
+
+    async def _request_web_api(
+        self,
+        job_id: str,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Optional[bytes],
+        timeout: aiohttp.ClientTimeout,
+    ) -> Dict[str, Any]:
+        """Perform a single PDF API request; retryable statuses raise ``PdfApiStatusError``."""
+        assert self._http_session is not None
+        started = time.perf_counter()
         async with self._http_session.request(
             method,
             url,
             headers=headers,
-            json=json_payload,
             data=data,
             timeout=timeout,
         ) as response:
-            raw_body = await response.text()
-            parsed_body: Any
-            try:
-                parsed_body = json.loads(raw_body)
-            except json.JSONDecodeError:
-                parsed_body = raw_body
+            headers_received = time.perf_counter()
+            self.metrics.observe_phase("pdf_api", headers_received - started)
+            if response.status in RETRYABLE_STATUSES:
+                message = (await response.text(errors="replace"))[:500]
+                raise PdfApiStatusError(response.status, message)
 
-            result = {
+            result: Dict[str, Any] = {
                 "status_code": response.status,
-                "headers": dict(response.headers),
-                "body": parsed_body,
+                "headers": self._kept_headers(response),
             }
 
+            if not _is_textual(response.headers.get("Content-Type")):
+                result.update(await self._spool_response(job_id, response))
+                self.metrics.observe_phase("response_read", time.perf_counter() - headers_received)
+                self.metrics.response_bytes.inc(result["size_bytes"])
+                return result
+
+            raw_bytes = await self._read_response(response)
+            self.metrics.observe_phase("response_read", time.perf_counter() - headers_received)
+            self.metrics.response_bytes.inc(len(raw_bytes))
+            parsed_body = loads_body(raw_bytes, response.charset)
+            result["body"] = parsed_body
+
             # Promote commonly used fields from JSON response
             if isinstance(parsed_body, dict):
                 for key in ("pdf_url", "download_url", "file_url"):
@@ -362,3 +1015,44 @@ class PdfJobWorker:
             return result
 
 
+def _write_file(path: str, data: bytes) -> str:
+    """Write ``data`` to ``path`` and return its SHA-256; runs off the event loop."""
+    with open(path, "wb") as handle:
+        handle.write(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_descriptor(path: str, size: int, sha256: str) -> Dict[str, Any]:
+    return {
+        "path": path,
+        "pdf_url": f"file://{path}",
+        "size_bytes": size,
+        "sha256": sha256,
+    }
+
+
+def _is_textual(content_type: Optional[str]) -> bool:
+    """Whether a response body should be decoded inline instead of spooled to disk."""
+    if not content_type:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("json")
+        or media_type.endswith("+xml")
+        or media_type in ("application/xml", "application/x-www-form-urlencoded")
+    )
+
+
+def _job_id(job_data: Dict[str, Any]) -> str:
+    """The job's id. A job without one gets a fresh id, stored on the payload so logging,
+    memory admission and result submission all see the same value."""
+    job_id = job_data.get("id")
+    if not job_id:
+        job_id = job_data["id"] = uuid.uuid4().hex
+    return job_id
+
+
+def _result_key(job_data: Dict[str, Any]) -> str:
+    job_type = job_data.get("job_type") or {}
+    return "local_response" if "RustJob" in job_type else "web_api_response"
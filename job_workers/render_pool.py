@@ -0,0 +1,125 @@
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .renderers import RenderOutput, default_registry
+
+
+logger = logging.getLogger(__name__)
+
+
+class RenderPool:
+    """Pre-warmed process pool running CPU-bound renderers off the worker's event loop.
+
+    Each child process registers the configured fonts and imports the renderer modules
+    once in its initializer, so individual jobs only pay for drawing. Renderers are
+    looked up in the child's default registry, which means custom renderers must live
+    in an importable module listed in ``renderer_modules``.
+    """
+
+    def __init__(
+        self,
+        *,
+        processes_per_core: float = 1.0,
+        max_workers: Optional[int] = None,
+        ttf_fonts: Optional[Dict[str, str]] = None,
+        cid_fonts: Sequence[str] = ("STSong-Light",),
+        renderer_modules: Iterable[str] = (),
+        prewarm: bool = True,
+        mp_context: str = "spawn",
+    ) -> None:
+        """
+        Args:
+            processes_per_core: Number of render processes started per CPU core.
+            max_workers: Explicit process count; overrides ``processes_per_core``.
+            ttf_fonts: Mapping of font name to TTF path registered in every process.
+            cid_fonts: Built-in CID fonts registered in every process.
+            renderer_modules: Modules imported in every process to register renderers.
+            prewarm: Start all processes (and load fonts) in ``start`` instead of lazily.
+            mp_context: Multiprocessing start method used for the children.
+        """
+        cores = os.cpu_count() or 1
+        self.max_workers = max_workers or max(int(cores * processes_per_core), 1)
+        self.ttf_fonts = dict(ttf_fonts or {})
+        self.cid_fonts = tuple(cid_fonts)
+        self.renderer_modules = tuple(renderer_modules)
+        self.prewarm = prewarm
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Create the process pool; blocks until every process is warm when ``prewarm`` is set."""
+        if self._executor is not None:
+            return
+
+        started_at = time.perf_counter()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.mp_context),
+            initializer=_init_render_process,
+            initargs=(self.ttf_fonts, self.cid_fonts, self.renderer_modules),
+        )
+        if self.prewarm:
+            futures = [self._executor.submit(_warm_up) for _ in range(self.max_workers)]
+            pids = {future.result() for future in futures}
+            logger.info(
+                "Render pool warmed %s/%s processes in %.0f ms",
+                len(pids),
+                self.max_workers,
+                (time.perf_counter() - started_at) * 1000,
+            )
+
+    def pids(self) -> List[int]:
+        """Process ids of the running render processes."""
+        processes = getattr(self._executor, "_processes", None) or {}
+        return list(processes)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def render(self, module: str, function: str, params: Any) -> RenderOutput:
+        """Run a registered renderer in a child process and return its output."""
+        if self._executor is None:
+            raise RuntimeError("Render pool not started")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, _render_in_process, module, function, params
+        )
+
+
+def _init_render_process(
+    ttf_fonts: Dict[str, str], cid_fonts: Sequence[str], renderer_modules: Sequence[str]
+) -> None:
+    if ttf_fonts or cid_fonts:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+        from reportlab.pdfbase.ttfonts import TTFont
+
+        for name in cid_fonts:
+            pdfmetrics.registerFont(UnicodeCIDFont(name))
+        for name, path in ttf_fonts.items():
+            pdfmetrics.registerFont(TTFont(name, path))
+
+    for module in renderer_modules:
+        importlib.import_module(module)
+
+
+def _warm_up() -> int:
+    # Hold each task briefly so the pool has to hand the next one to a fresh process.
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _render_in_process(module: str, function: str, params: Any) -> RenderOutput:
+    return default_registry.get(module, function)(params)
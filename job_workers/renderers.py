@@ -0,0 +1,50 @@
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+
+RenderOutput = Union[bytes, Dict[str, Any]]
+Renderer = Callable[[Any], RenderOutput]
+
+
+class RendererRegistry:
+    """In-process renderers addressed by the ``module``/``function`` pair of a ``RustJob``."""
+
+    def __init__(self) -> None:
+        self._renderers: Dict[Tuple[str, str], Renderer] = {}
+
+    def register(
+        self, module: str, function: str, renderer: Optional[Renderer] = None
+    ) -> Callable[[Renderer], Renderer]:
+        """Register ``renderer`` directly, or return a decorator when it is omitted."""
+
+        def decorator(func: Renderer) -> Renderer:
+            self._renderers[(module, function)] = func
+            return func
+
+        if renderer is not None:
+            decorator(renderer)
+        return decorator
+
+    def get(self, module: str, function: str) -> Renderer:
+        try:
+            return self._renderers[(module, function)]
+        except KeyError:
+            raise ValueError(f"No renderer registered for {module}.{function}") from None
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._renderers
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self._renderers)
+
+    def __len__(self) -> int:
+        return len(self._renderers)
+
+
+# Empty until renderer modules are imported (e.g. ``job_workers.roy_renderer``): a worker
+# only advertises and runs the ``RustJob`` renderers its deployment opted into.
+default_registry = RendererRegistry()
+
+
+def register_renderer(module: str, function: str) -> Callable[[Renderer], Renderer]:
+    """Decorator registering a renderer on the default registry."""
+    return default_registry.register(module, function)
@@ -0,0 +1,153 @@
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalise_request(method: str, url: str, body: Any) -> bytes:
+    """Canonical byte form of a PDF API request used as the cache identity.
+
+    The method is upper-cased, scheme/host lower-cased, query parameters sorted, and
+    JSON bodies (given as text or objects) re-serialised with sorted keys.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical_url = urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, "")
+    )
+
+    if isinstance(body, (bytes, bytearray)):
+        body = body.decode("utf-8", errors="replace")
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except json.JSONDecodeError:
+            pass
+    if isinstance(body, str) or body is None:
+        canonical_body = body or ""
+    else:
+        canonical_body = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+    return "\n".join((method.upper(), canonical_url, canonical_body)).encode("utf-8")
+
+
+def cache_key(method: str, url: str, body: Any) -> str:
+    return hashlib.sha256(normalise_request(method, url, body)).hexdigest()
+
+
+class ResultCache:
+    """LRU cache of successful PDF API results with a TTL and optional on-disk backing.
+
+    Entries whose result references a spooled file (``path``) are treated as misses
+    once that file is gone, so a cleaned output directory never yields dead links.
+    Disk reads and writes run in a thread so a slow disk never stalls the event loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl: float = 24 * 3600.0,
+        disk_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            max_entries: Number of results kept in memory (least recently used evicted).
+            ttl: Seconds a result stays valid.
+            disk_dir: Directory persisting results across restarts and processes.
+            clock: Wall clock used for expiry (also stored on disk).
+        """
+        self.max_entries = max(max_entries, 1)
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None and self.disk_dir:
+            entry = await asyncio.to_thread(self._read_disk, key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        if entry is not None and self._valid(entry):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+        if entry is not None:
+            await self.discard(key)
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, value: Dict[str, Any]) -> None:
+        entry = (self.clock(), copy.deepcopy(value))
+        self._remember(key, entry)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, entry)
+
+    async def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self.disk_dir:
+            await asyncio.to_thread(self._remove_disk, key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _valid(self, entry: Tuple[float, Dict[str, Any]]) -> bool:
+        stored_at, value = entry
+        if self.clock() - stored_at > self.ttl:
+            return False
+        path = value.get("path")
+        return not path or os.path.exists(path)
+
+    def _disk_path(self, key: str) -> str:
+        assert self.disk_dir is not None
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            return float(data["stored_at"]), data["value"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, exc)
+            return None
+
+    def _remove_disk(self, key: str) -> None:
+        try:
+            os.remove(self._disk_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _write_disk(self, key: str, entry: Tuple[float, Dict[str, Any]]) -> None:
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial_path = f"{path}.part"
+            with open(partial_path, "w", encoding="utf-8") as handle:
+                json.dump({"stored_at": entry[0], "value": entry[1]}, handle)
+            os.replace(partial_path, path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.warning("Could not persist cache entry %s: %s", path, exc)
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingResult:
+    """A job result waiting to be submitted to the Job Manager."""
+
+    job_id: str
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    execution_time_ms: Optional[int] = None
+    attempts: int = 0
+
+
+ResultSender = Callable[[PendingResult], Awaitable[bool]]
+
+
+class ResultSubmitter:
+    """Bounded in-memory queue of job results drained by background submitters.
+
+    Jobs enqueue their result and release their concurrency slot immediately. Several
+    submitter tasks post results concurrently and retry failures. Whatever is still
+    queued when ``stop`` times out is appended to ``spool_path`` (JSON lines) and
+    re-enqueued by the next ``start``. Spool file IO runs in a thread, off the loop.
+    """
+
+    def __init__(
+        self,
+        send: ResultSender,
+        *,
+        max_queue: int = 1000,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        retry_delay: float = 1.0,
+        spool_path: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            send: Coroutine submitting one result; returns ``True`` when accepted.
+            max_queue: Queue capacity; ``put`` waits when it is full.
+            concurrency: Number of submitter tasks running in parallel.
+            max_attempts: Attempts per result before it is spooled (or dropped).
+            retry_delay: Base delay (seconds) between attempts, doubled per attempt.
+            spool_path: Optional JSON lines file used to persist unsent results.
+        """
+        self.send = send
+        self.max_queue = max_queue
+        self.concurrency = max(concurrency, 1)
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_delay = retry_delay
+        self.spool_path = spool_path
+        self._queue: Optional["asyncio.Queue[PendingResult]"] = None
+        self._tasks: List[asyncio.Task] = []
+        self._unsent: List[PendingResult] = []
+        self._spool_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        async with self._spool_lock:
+            items = await asyncio.to_thread(self._load_spool)
+        for item in items[: self.max_queue]:
+            self._queue.put_nowait(item)
+        if len(items) > self.max_queue:
+            self._unsent.extend(items[self.max_queue:])
+            await self._write_spool()
+        self._tasks = [
+            asyncio.create_task(self._drain(), name=f"pdf-worker-results-{index}")
+            for index in range(self.concurrency)
+        ]
+
+    async def put(self, item: PendingResult) -> None:
+        if self._queue is None:
+            raise RuntimeError("Result submitter not started")
+        await self._queue.put(item)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Wait up to ``timeout`` seconds for the queue to drain, then spool the rest."""
+        if not self._tasks or self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Result queue not drained within %.1fs", timeout)
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            self._unsent.append(self._queue.get_nowait())
+        self._queue = None
+        await self._write_spool()
+
+    async def _drain(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            item = await queue.get()
+            try:
+                await self._send_with_retries(item)
+            except asyncio.CancelledError:
+                self._unsent.append(item)
+                raise
+            finally:
+                queue.task_done()
+
+    async def _send_with_retries(self, item: PendingResult) -> None:
+        while item.attempts < self.max_attempts:
+            if item.attempts:
+                await asyncio.sleep(self.retry_delay * (2 ** (item.attempts - 1)))
+            item.attempts += 1
+            try:
+                if await self.send(item):
+                    return
+            except Exception as exc:
+                logger.warning("Result submission for job %s raised: %s", item.job_id, exc)
+
+        logger.error(
+            "Giving up on result for job %s after %s attempts", item.job_id, item.attempts
+        )
+        item.attempts = 0
+        self._unsent.append(item)
+        await self._write_spool()
+
+    async def _write_spool(self) -> None:
+        if not self._unsent:
+            return
+        items, self._unsent = self._unsent, []
+        if not self.spool_path:
+            logger.error("Dropping %s unsent job results (no spool configured)", len(items))
+            return
+        # Submitters give up concurrently; the lock keeps their appends from interleaving.
+        async with self._spool_lock:
+            await asyncio.to_thread(self._append_spool, items)
+        logger.info("Spooled %s job results to %s", len(items), self.spool_path)
+
+    def _append_spool(self, items: List[PendingResult]) -> None:
+        assert self.spool_path is not None
+        directory = os.path.dirname(self.spool_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.spool_path, "a", encoding="utf-8") as handle:
+            for item in items:
+                handle.write(json.dumps(asdict(item)) + "\n")
+
+    def _load_spool(self) -> List[PendingResult]:
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return []
+        items: List[PendingResult] = []
+        with open(self.spool_path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    items.append(PendingResult(**json.loads(line)))
+        os.remove(self.spool_path)
+        return items
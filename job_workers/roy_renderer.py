@@ -0,0 +1,68 @@
+"""Built-in ``roy_pdf_library.render_pages`` renderer.
+
+Importing this module registers the renderer on the default registry; pass it to
+``build_worker(renderer_modules=...)`` or ``RenderPool(renderer_modules=...)`` to
+opt in. The host needs ``roy_pdf_library`` and its fonts.
+"""
+
+from typing import Any, Dict
+
+from .renderers import register_renderer
+
+
+# Pure drawing calls only. Anything reading files or URLs (``upload_image``) or parsing
+# Paragraph markup (``<img src>`` in ``draw_cognitive_domain``) stays out of reach of
+# job payloads.
+DRAWING_OPS = frozenset(
+    {
+        "draw_bulletin",
+        "draw_circle",
+        "draw_cut_rectangle",
+        "draw_dotted_line",
+        "draw_line",
+        "draw_rect",
+        "draw_rounded_rect_one_corner",
+        "draw_ruler",
+        "draw_string",
+        "draw_string_list",
+        "draw_string_vertically_centered",
+        "draw_two_table",
+    }
+)
+
+
+@register_renderer("roy_pdf_library", "render_pages")
+def render_roy_pages(params: Dict[str, Any]) -> bytes:
+    """Render a document described as a list of ``PDFDrawer`` calls per page.
+
+    ``params`` layout::
+
+        {
+            "pagesize": [595, 960],
+            "pages": [
+                [{"op": "draw_string", "kwargs": {"x": 100, "y": 700, "text": "Hi"}}],
+                [{"op": "draw_ruler", "args": [595, 960]}],
+            ],
+        }
+
+    ``op`` must be one of ``DRAWING_OPS``.
+    """
+    from roy_pdf_library import PDFDrawer, PDFGenerator
+
+    pagesize = params.get("pagesize")
+    pages = params.get("pages") or [[]]
+
+    pdf = PDFGenerator(None, pagesize=tuple(pagesize) if pagesize else None)
+    drawer = pdf.get_drawer()
+
+    for index, operations in enumerate(pages):
+        if index:
+            pdf.show_page()
+        for operation in operations:
+            name = operation.get("op", "")
+            if name not in DRAWING_OPS:
+                raise ValueError(f"Unsupported PDFDrawer operation: {name!r}")
+            method = getattr(PDFDrawer, name)
+            method(drawer, *operation.get("args", []), **operation.get("kwargs", {}))
+
+    return pdf.save()
@@ -0,0 +1,66 @@
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Tuple
+
+from .fetcher import JobBuffer
+
+
+PRIORITY_RANKS: Dict[str, int] = {"Low": 0, "Normal": 1, "High": 2, "Urgent": 3}
+DEFAULT_PRIORITY = "Normal"
+
+
+def job_priority(job_data: Dict[str, Any]) -> int:
+    """Rank of the job's ``JobPriority``; unknown or missing values count as Normal."""
+    priority = job_data.get("priority") or DEFAULT_PRIORITY
+    return PRIORITY_RANKS.get(priority, PRIORITY_RANKS[DEFAULT_PRIORITY])
+
+
+class PriorityJobBuffer(JobBuffer):
+    """Job buffer that hands out the highest ``JobPriority`` first, with aging.
+
+    Jobs are kept in one FIFO per priority. A waiting job gains one priority level per
+    ``aging_interval`` seconds, so bulk Low/Normal batches still make progress while
+    Urgent and High jobs keep arriving. Ties go to the job with the higher base priority.
+    """
+
+    def __init__(
+        self, *, aging_interval: float = 30.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        super().__init__()
+        self.aging_interval = aging_interval
+        self.clock = clock
+        self._queues: Dict[int, Deque[Tuple[float, Dict[str, Any]]]] = {
+            rank: deque() for rank in sorted(PRIORITY_RANKS.values())
+        }
+
+    def put(self, job_data: Dict[str, Any]) -> None:
+        self._queues[job_priority(job_data)].append((self.clock(), job_data))
+
+    def pop(self) -> Dict[str, Any]:
+        now = self.clock()
+        best_rank = None
+        best_score = float("-inf")
+        for rank in sorted(self._queues, reverse=True):
+            queue = self._queues[rank]
+            if not queue:
+                continue
+            waited = now - queue[0][0]
+            score = rank + (waited / self.aging_interval if self.aging_interval > 0 else 0.0)
+            if score > best_score:
+                best_rank, best_score = rank, score
+        if best_rank is None:
+            raise IndexError("pop from an empty job buffer")
+        return self._queues[best_rank].popleft()[1]
+
+    def drain(self) -> List[Dict[str, Any]]:
+        items = [
+            entry
+            for queue in self._queues.values()
+            for entry in queue
+        ]
+        for queue in self._queues.values():
+            queue.clear()
+        return [job_data for _, job_data in sorted(items, key=lambda entry: entry[0])]
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
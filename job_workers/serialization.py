@@ -0,0 +1,84 @@
+import json
+from typing import Any, Dict, Optional, Sequence, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+
+JSON_CONTENT_TYPE = "application/json"
+
+_UTF8_CHARSETS = frozenset({"utf-8", "utf8", "us-ascii", "ascii"})
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles those
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_text(value: Any) -> str:
+    return dumps(value).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON from bytes or text; raises ``ValueError`` on malformed input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+def loads_body(raw: bytes, charset: Optional[str]) -> Any:
+    """Parse a response body straight from bytes, falling back to the decoded text.
+
+    UTF-8 (or unspecified) bodies are handed to the parser without an intermediate
+    ``str``; other charsets are decoded first, and an unknown charset falls back to
+    UTF-8 like ``aiohttp``'s ``response.text()``. Non-JSON bodies are returned as text.
+    """
+    encoding = (charset or "utf-8").lower().replace("_", "-")
+    if encoding in _UTF8_CHARSETS:
+        try:
+            return loads(raw)
+        except ValueError:
+            return raw.decode("utf-8", errors="replace")
+    try:
+        text = raw.decode(encoding, errors="replace")
+    except (LookupError, UnicodeDecodeError):
+        text = raw.decode("utf-8", errors="replace")
+    try:
+        return loads(text)
+    except ValueError:
+        return text
+
+
+def project(value: Dict[str, Any], fields: Optional[Sequence[str]]) -> Dict[str, Any]:
+    """Keep only the dotted ``fields`` paths of ``value`` (``None`` keeps everything).
+
+    ``("status_code", "pdf_url", "body.report_id")`` keeps two top-level keys and the
+    nested ``report_id`` of ``body``; paths missing from ``value`` are skipped.
+    """
+    if fields is None:
+        return value
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        parts = path.split(".")
+        source: Any = value
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                child = target.setdefault(part, {})
+                if not isinstance(child, dict):
+                    break
+                target = child
+            else:
+                target[parts[-1]] = source
+    return projected
@@ -0,0 +1,407 @@
+"""Run one ``PdfJobWorker`` per CPU core in child processes.
+
+Example::
+
+    python -m job_workers.supervisor --job-manager-url https://host/api/v1/jobs \\
+        --pdf-api-url https://pdf.local/generate --push --processes 8 --metrics-port 9464
+
+``--push`` runs a callback listener per worker for jobs pushed by the Job Manager;
+``--lease`` pulls from the local Job Manager's lease endpoint instead.
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import aiohttp
+from aiohttp import web
+
+from .http_pool import bound_port
+from .local_job_manager import leasing_job_fetcher
+from .metrics import MetricsRegistry, merge_expositions
+from .pdf_job_worker import PdfJobWorker, WorkerConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+WorkerFactory = Callable[..., PdfJobWorker]
+
+
+def default_process_count() -> int:
+    """CPUs this process may run on (respects container CPU affinity)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+
+def build_worker(
+    worker_id: str,
+    *,
+    job_manager_url: str,
+    pdf_api_url: Optional[str] = None,
+    lease_jobs: bool = False,
+    renderer_modules: Sequence[str] = (),
+    **options: Any,
+) -> PdfJobWorker:
+    """Default worker factory; ``options`` are passed through to ``PdfJobWorker``.
+
+    ``renderer_modules`` are imported first so their ``RustJob`` renderers land in the
+    default registry (``job_workers.roy_renderer`` enables the built-in one).
+
+    Raises:
+        ValueError: The worker would have no way to receive jobs. The Job Manager spec
+            has no endpoint a worker can pull from, so it needs ``lease_jobs`` (the
+            local Job Manager's lease endpoint), a ``job_fetcher`` or a ``callback_port``.
+    """
+    job_fetcher = leasing_job_fetcher if lease_jobs else options.pop("job_fetcher", None)
+    if job_fetcher is None and options.get("callback_port") is None:
+        raise ValueError(
+            "Worker has no job source: pass lease_jobs=True (--lease), a job_fetcher, "
+            "or a callback_port (--push)"
+        )
+    for module in renderer_modules:
+        importlib.import_module(module)
+    return PdfJobWorker(
+        job_manager_url=job_manager_url,
+        worker_id=worker_id,
+        worker_config=WorkerConfig(pdf_api_url=pdf_api_url) if pdf_api_url else None,
+        job_fetcher=job_fetcher,
+        **options,
+    )
+
+
+@dataclass
+class _ChildSlot:
+    index: int
+    worker_id: str
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started_at: float = 0.0
+    failures: int = 0
+    restarts: int = 0
+    restart_at: Optional[float] = None
+    metrics_port: Optional[int] = None
+
+
+class WorkerSupervisor:
+    """Fork ``PdfJobWorker`` children, restart crashed ones and aggregate their metrics.
+
+    Child ``i`` always runs as ``f"{worker_id_prefix}-{i}"``, so the Job Manager sees the
+    same worker ids across restarts. Every child builds its own worker (and therefore its
+    own HTTP sessions) through ``worker_factory(worker_id, **options)``; custom factories
+    must forward ``options`` to ``PdfJobWorker`` and be picklable.
+    """
+
+    def __init__(
+        self,
+        worker_factory: WorkerFactory,
+        *,
+        processes: Optional[int] = None,
+        worker_id_prefix: Optional[str] = None,
+        restart_delay: float = 1.0,
+        max_restart_delay: float = 30.0,
+        stable_after: float = 30.0,
+        drain_timeout: float = 60.0,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = "127.0.0.1",
+        monitor_interval: float = 0.5,
+        mp_context: str = "spawn",
+    ) -> None:
+        """
+        Args:
+            worker_factory: Picklable callable building a worker inside each child.
+            processes: Number of children; defaults to the usable CPU count.
+            worker_id_prefix: Prefix of the derived worker ids (defaults to the hostname).
+            restart_delay: Initial delay (seconds) before restarting a crashed child.
+            max_restart_delay: Upper bound of the exponential restart backoff.
+            stable_after: Seconds a child must run before its crash backoff resets.
+            drain_timeout: Seconds each child may drain in-flight jobs on shutdown.
+            metrics_port: When set, serve the merged ``/metrics`` of all children (with a
+                ``worker_id`` label) on this port (``0`` picks a free port).
+            metrics_host: Interface the aggregated metrics endpoint binds to.
+            monitor_interval: Seconds between child liveness checks.
+            mp_context: ``multiprocessing`` start method for the children.
+        """
+        self.worker_factory = worker_factory
+        self.processes = processes or default_process_count()
+        self.worker_id_prefix = worker_id_prefix or f"pdf-worker-{socket.gethostname()}"
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.stable_after = stable_after
+        self.drain_timeout = drain_timeout
+        self.metrics_port = metrics_port
+        self.metrics_host = metrics_host
+        self.monitor_interval = monitor_interval
+        self._context = multiprocessing.get_context(mp_context)
+        self._ready: Optional[Any] = None
+        self._slots: List[_ChildSlot] = [
+            _ChildSlot(index, f"{self.worker_id_prefix}-{index}") for index in range(self.processes)
+        ]
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._metrics_runner: Optional[web.AppRunner] = None
+        self._stopping = False
+
+        self.registry = MetricsRegistry()
+        self._restarts = self.registry.counter(
+            "pdf_supervisor_restarts_total", "Worker processes restarted after exiting."
+        )
+        self.registry.gauge(
+            "pdf_supervisor_children_alive", "Worker processes currently running.", self.alive_count
+        )
+
+    @property
+    def worker_ids(self) -> List[str]:
+        return [slot.worker_id for slot in self._slots]
+
+    @property
+    def metrics_bound_port(self) -> Optional[int]:
+        return bound_port(self._metrics_runner)
+
+    def pids(self) -> Dict[str, Optional[int]]:
+        return {
+            slot.worker_id: slot.process.pid if slot.process is not None else None
+            for slot in self._slots
+        }
+
+    def alive_count(self) -> int:
+        return sum(1 for slot in self._slots if slot.process is not None and slot.process.is_alive())
+
+    async def start(self) -> None:
+        """Launch every child and begin monitoring them."""
+        if self._monitor_task is not None:
+            return
+        self._stopping = False
+        self._ready = self._context.Queue()
+        for slot in self._slots:
+            self._spawn(slot)
+        if self.metrics_port is not None:
+            app = web.Application()
+            app.router.add_get("/metrics", self._handle_metrics)
+            self._metrics_runner = web.AppRunner(app)
+            await self._metrics_runner.setup()
+            await web.TCPSite(self._metrics_runner, self.metrics_host, self.metrics_port).start()
+        self._monitor_task = asyncio.create_task(self._monitor(), name="pdf-supervisor-monitor")
+        logger.info("Supervisor started %s worker processes", self.processes)
+
+    async def stop(self) -> None:
+        """Ask every child to drain and exit; kill those that overrun the drain timeout."""
+        self._stopping = True
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            await asyncio.gather(self._monitor_task, return_exceptions=True)
+            self._monitor_task = None
+
+        running = [slot.process for slot in self._slots if slot.process is not None and slot.process.is_alive()]
+        for process in running:
+            process.terminate()
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.drain_timeout + 10.0
+        for process in running:
+            await loop.run_in_executor(None, process.join, max(deadline - time.monotonic(), 0.0))
+            if process.is_alive():
+                logger.warning("Worker process %s did not exit in time; killing it", process.pid)
+                process.kill()
+                await loop.run_in_executor(None, process.join)
+
+        if self._metrics_runner is not None:
+            await self._metrics_runner.cleanup()
+            self._metrics_runner = None
+        if self._ready is not None:
+            self._ready.close()
+            self._ready = None
+        logger.info("Supervisor stopped")
+
+    async def run(self) -> None:
+        """Run until SIGTERM or SIGINT, then shut the children down gracefully."""
+        loop = asyncio.get_running_loop()
+        stop_requested = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop_requested.set)
+        await self.start()
+        try:
+            await stop_requested.wait()
+        finally:
+            await self.stop()
+
+    def _spawn(self, slot: _ChildSlot) -> None:
+        options: Dict[str, Any] = {}
+        if self.metrics_port is not None:
+            options["metrics_port"] = 0
+        slot.process = self._context.Process(
+            target=_child_main,
+            args=(self.worker_factory, slot.worker_id, options, self.drain_timeout, self._ready),
+            name=slot.worker_id,
+        )
+        slot.process.start()
+        slot.started_at = time.monotonic()
+        slot.restart_at = None
+        slot.metrics_port = None
+
+    async def _monitor(self) -> None:
+        while True:
+            self._collect_ready()
+            now = time.monotonic()
+            for slot in self._slots:
+                process = slot.process
+                if process is None or process.is_alive():
+                    continue
+                if slot.restart_at is None:
+                    if now - slot.started_at >= self.stable_after:
+                        slot.failures = 0
+                    delay = min(self.restart_delay * 2 ** slot.failures, self.max_restart_delay)
+                    slot.failures += 1
+                    slot.restart_at = now + delay
+                    logger.warning(
+                        "Worker %s (pid %s) exited with code %s; restarting in %.1fs",
+                        slot.worker_id,
+                        process.pid,
+                        process.exitcode,
+                        delay,
+                    )
+                elif now >= slot.restart_at:
+                    slot.restarts += 1
+                    self._restarts.inc()
+                    self._spawn(slot)
+            await asyncio.sleep(self.monitor_interval)
+
+    def _collect_ready(self) -> None:
+        if self._ready is None:
+            return
+        slots = {slot.worker_id: slot for slot in self._slots}
+        while True:
+            try:
+                worker_id, pid, metrics_port = self._ready.get_nowait()
+            except queue.Empty:
+                return
+            slot = slots.get(worker_id)
+            if slot is not None and slot.process is not None and slot.process.pid == pid:
+                slot.metrics_port = metrics_port
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        self._collect_ready()
+        targets = {
+            slot.worker_id: f"http://127.0.0.1:{slot.metrics_port}/metrics"
+            for slot in self._slots
+            if slot.metrics_port and slot.process is not None and slot.process.is_alive()
+        }
+        timeout = aiohttp.ClientTimeout(total=5)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+
+            async def scrape(url: str) -> Optional[str]:
+                try:
+                    async with session.get(url) as response:
+                        return await response.text() if response.status == 200 else None
+                except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                    logger.debug("Scraping %s failed: %s", url, exc)
+                    return None
+
+            bodies = await asyncio.gather(*(scrape(url) for url in targets.values()))
+        scraped = {worker_id: body for worker_id, body in zip(targets, bodies) if body is not None}
+        text = merge_expositions(scraped) + self.registry.render()
+        return web.Response(
+            body=text.encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+
+def _child_main(
+    factory: WorkerFactory,
+    worker_id: str,
+    options: Dict[str, Any],
+    drain_timeout: float,
+    ready: Any,
+) -> None:
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO, format=f"%(asctime)s - {worker_id} - %(levelname)s - %(message)s"
+        )
+    asyncio.run(_run_child(factory, worker_id, options, drain_timeout, ready))
+
+
+async def _run_child(
+    factory: WorkerFactory,
+    worker_id: str,
+    options: Dict[str, Any],
+    drain_timeout: float,
+    ready: Any,
+) -> None:
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    worker = factory(worker_id, **options)
+    await worker.start()
+    try:
+        metrics_server = worker._metrics_server
+        ready.put((worker_id, os.getpid(), metrics_server.bound_port if metrics_server else None))
+        await stop_requested.wait()
+    finally:
+        await worker.stop(drain=True, drain_timeout=drain_timeout)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run one PdfJobWorker per CPU core.")
+    parser.add_argument("--job-manager-url", required=True)
+    parser.add_argument("--pdf-api-url", default=None)
+    parser.add_argument("--processes", type=int, default=None, help="Defaults to the usable CPU count")
+    parser.add_argument("--worker-id-prefix", default=None)
+    parser.add_argument("--max-concurrent-jobs", type=int, default=2)
+    parser.add_argument("--poll-interval", type=float, default=2.0)
+    parser.add_argument(
+        "--max-poll-interval",
+        type=float,
+        default=5.0,
+        help="Cap of the idle poll backoff: pickup latency vs. polling load on the Job Manager",
+    )
+    parser.add_argument("--lease", action="store_true", help="Pull jobs via POST /workers/{id}/lease")
+    parser.add_argument("--push", action="store_true", help="Run a callback listener per worker for pushed jobs")
+    parser.add_argument("--callback-host", default="127.0.0.1")
+    parser.add_argument(
+        "--renderer-module",
+        action="append",
+        default=[],
+        help="Import a RustJob renderer module in every worker (e.g. job_workers.roy_renderer)",
+    )
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--metrics-port", type=int, default=None)
+    parser.add_argument("--metrics-host", default="127.0.0.1")
+    args = parser.parse_args(argv)
+    if not args.lease and not args.push:
+        parser.error("workers need a job source: pass --lease and/or --push")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    push_options = {"callback_port": 0, "callback_host": args.callback_host} if args.push else {}
+    supervisor = WorkerSupervisor(
+        partial(
+            build_worker,
+            job_manager_url=args.job_manager_url,
+            pdf_api_url=args.pdf_api_url,
+            lease_jobs=args.lease,
+            renderer_modules=tuple(args.renderer_module),
+            max_concurrent_jobs=args.max_concurrent_jobs,
+            poll_interval=args.poll_interval,
+            max_poll_interval=args.max_poll_interval,
+            **push_options,
+        ),
+        processes=args.processes,
+        worker_id_prefix=args.worker_id_prefix,
+        drain_timeout=args.drain_timeout,
+        metrics_port=args.metrics_port,
+        metrics_host=args.metrics_host,
+    )
+    asyncio.run(supervisor.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 # Roy's PDF Library
 # 自定义PDF生成库，包含所有绘图和文本处理函数
 
+import os
+import threading
+import time
+
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import Paragraph
 from reportlab.lib.enums import TA_JUSTIFY
@@ -11,8 +16,67 @@ from reportlab.lib import colors
 from reportlab.platypus import Table, TableStyle
 from reportlab.lib.units import cm
 
-# 注册中文字体
-pdfmetrics.registerFont(UnicodeCIDFont("STSong-Light"))
+
+class FontRegistry:
+    """字体注册表：登记字体名与文件，首次使用时才解析并注册
+
+    登记后 ReportLab 查找未注册的字体名（setFont、stringWidth、段落、表格等）时
+    会自动加载对应字体；解析结果注册在 pdfmetrics 中，进程内所有文档共享。
+    """
+
+    def __init__(self):
+        self._sources = {}
+        self._load_times = {}
+        self._lock = threading.RLock()
+        self._fallback = None
+
+    def add(self, name, path=None):
+        """登记字体；path 为 TTF 文件路径，None 表示 ReportLab 内置的 CID 字体"""
+        self._sources[name] = os.path.abspath(path) if path is not None else None
+        # 段落在取字体之前先按字体族名解析粗体/斜体，族名映射需要立即登记（不解析字体文件）
+        pdfmetrics.registerFontFamily(name)
+        self._install()
+
+    def load(self, name):
+        """解析并注册字体（只在首次调用时进行），返回字体对象"""
+        with self._lock:
+            if name not in self._load_times:
+                path = self._sources[name]
+                started = time.perf_counter()
+                if path is None:
+                    pdfmetrics.registerFont(UnicodeCIDFont(name))
+                else:
+                    pdfmetrics.registerFont(TTFont(name, path))
+                self._load_times[name] = time.perf_counter() - started
+            return pdfmetrics.getFont(name)
+
+    def is_loaded(self, name):
+        """字体是否已解析"""
+        return name in self._load_times
+
+    def report(self):
+        """已加载字体的加载耗时（秒）"""
+        return dict(self._load_times)
+
+    def __contains__(self, name):
+        return name in self._sources
+
+    def _install(self):
+        # 挂接 ReportLab 查找未注册字体的入口，未登记的字体名仍交给原来的处理
+        if self._fallback is None:
+            self._fallback = pdfmetrics.findFontAndRegister
+            pdfmetrics.findFontAndRegister = self._find_font_and_register
+
+    def _find_font_and_register(self, name):
+        if name in self._sources:
+            return self.load(name)
+        return self._fallback(name)
+
+
+font_registry = FontRegistry()
+
+# 登记中文字体（首次使用时加载）
+font_registry.add("STSong-Light")
 
 
 class Colors:
@@ -29,19 +93,116 @@ class Colors:
     WHITE = [1, 1, 1]
 
 
+def _same_color(current, rgb):
+    """Canvas 当前颜色是否就是给定的 RGB 值"""
+    return isinstance(current, tuple) and current == rgb
+
+
+class ParagraphStyles:
+    """段落样式注册表：同一名称和参数的样式在进程内只创建一次
+
+    返回的样式是共享对象，调用方不要修改它。
+    """
+
+    def __init__(self):
+        self._sample = None
+        self._styles = {}
+
+    def sample(self):
+        """ReportLab 示例样式表（首次使用时创建）"""
+        if self._sample is None:
+            self._sample = getSampleStyleSheet()
+        return self._sample
+
+    def get(self, name, parent="Normal", **params):
+        """按名称和参数获取样式；parent 为示例样式表中的样式名，None 表示无父样式"""
+        key = (name, parent,
+               tuple(sorted((k, repr(v)) for k, v in params.items())))
+        style = self._styles.get(key)
+        if style is None:
+            parent_style = self.sample()[parent] if parent else None
+            style = ParagraphStyle(name=name, parent=parent_style, **params)
+            self._styles[key] = style
+        return style
+
+    def __len__(self):
+        return len(self._styles)
+
+
+paragraph_styles = ParagraphStyles()
+
+
 class PDFDrawer:
     """PDF绘图工具类"""
 
     def __init__(self, canvas_obj):
         self.c = canvas_obj
+        # 状态未知的项（见 forget_state）；只记录在绘图器里，不改动 Canvas 的属性
+        self._unknown = set()
+
+    # 图形状态缓存：Canvas 会在 saveState/restoreState 和换页时保存、恢复
+    # _fontname、_fillColorObj、_lineWidth、_extgstate 等属性，下面的方法与之比较，
+    # 只有状态真正变化时才输出 PDF 操作符。
+
+    def _is_known(self, key):
+        """状态项是否可信；未知的项视为已变化，并在本次设置后重新变为已知"""
+        if key in self._unknown:
+            self._unknown.discard(key)
+            return False
+        return True
+
+    def set_font(self, font, font_size):
+        """设置字体（未变化时不输出操作符）"""
+        if self.c._fontname != font or self.c._fontsize != font_size:
+            self.c.setFont(font, font_size)
+
+    def set_fill_color(self, color, alpha=None):
+        """设置填充颜色和透明度（未变化时不输出操作符）"""
+        rgb = (color[0], color[1], color[2])
+        if not self._is_known('fill') or not _same_color(self.c._fillColorObj, rgb):
+            self.c.setFillColorRGB(*rgb)
+        if alpha is not None and (not self._is_known('fill_alpha')
+                                  or self.c._extgstate.getValue('ca') != alpha):
+            self.c.setFillAlpha(alpha)
+
+    def set_stroke_color(self, color, alpha=None):
+        """设置描边颜色和透明度（未变化时不输出操作符）"""
+        rgb = (color[0], color[1], color[2])
+        if not self._is_known('stroke') or not _same_color(self.c._strokeColorObj, rgb):
+            self.c.setStrokeColorRGB(*rgb)
+        if alpha is not None and (not self._is_known('stroke_alpha')
+                                  or self.c._extgstate.getValue('CA') != alpha):
+            self.c.setStrokeAlpha(alpha)
+
+    def set_line_width(self, width):
+        """设置线宽（未变化时不输出操作符）"""
+        if not self._is_known('line_width') or self.c._lineWidth != width:
+            self.c.setLineWidth(width)
+
+    def set_dash(self, dash=None):
+        """设置虚线样式，None 或空列表表示实线（未变化时不输出操作符）"""
+        dash = tuple(dash) if dash else None
+        if not self._is_known('dash') or self.c._lineDash != dash:
+            self.c.setDash(list(dash) if dash else [])
+            # Canvas.setDash 本身不记录线型；_lineDash 属于 Canvas 的状态属性，
+            # 记录在这里即可随 saveState/restoreState 和换页一起恢复
+            self.c._lineDash = dash
+
+    def forget_state(self):
+        """将颜色、透明度、线宽和虚线标记为未知，之后的设置都会输出操作符
+
+        Canvas 的状态属性保持不变：Paragraph 等 ReportLab 代码仍会读取它们。
+        """
+        self._unknown.update(('fill', 'fill_alpha', 'stroke', 'stroke_alpha',
+                              'line_width', 'dash'))
 
     def draw_string_vertically_centered(self, x, y, text, font='Helvetica',
                                         font_size=12, color=None, alpha=1):
         """绘制垂直居中的文本"""
         if color is None:
             color = [0, 0, 0]
-        self.c.setFont(font, font_size)
-        self.c.setFillColorRGB(color[0], color[1], color[2], alpha=alpha)
+        self.set_font(font, font_size)
+        self.set_fill_color(color, alpha=alpha)
         text_height = font_size * 1.2
         adjusted_y = y + (text_height / 2)
         self.c.drawString(x, adjusted_y, text)
@@ -74,18 +235,14 @@ class PDFDrawer:
             y = y_start - (item_index * y_decrement)
             y_circle = y_circle_start - (item_index * y_decrement)
 
-            self.c.setFont("STSong-Light", size=font_size)
-            self.c.setFillColorRGB(0, 0, 0)
-            self.c.setStrokeColorRGB(0, 0, 0)
-            self.c.setLineWidth(linewidth)
+            self.set_font("STSong-Light", font_size)
+            self.set_fill_color(Colors.BLACK)
+            self.set_stroke_color(Colors.BLACK)
+            self.set_line_width(linewidth)
             self.c.rotate(90)
             self.c.circle(y_circle, x_cen, r, stroke=1, fill=0)
             self.c.rotate(-90)
-            self.c.setFont("STSong-Light", size=font_size)
-            self.c.setFillColorRGB(0, 0, 0)
             self.c.drawString(x_start + 10, y, str(item_index + 1))
-            self.c.setFont("STSong-Light", size=font_size)
-            self.c.setFillColorRGB(0, 0, 0)
             self.c.drawString(x_start + 20, y, item)
 
     def draw_line(self, x1, y1, x2, y2, width=1, color=None, alpha=1,
@@ -93,13 +250,13 @@ class PDFDrawer:
         """绘制直线"""
         if color is None:
             color = [0, 0, 0]
-        self.c.setStrokeColorRGB(color[0], color[1], color[2], alpha=alpha)
-        self.c.setLineWidth(width)
+        self.set_stroke_color(color, alpha=alpha)
+        self.set_line_width(width)
         if dash is not None:
-            self.c.setDash(dash)
+            self.set_dash(dash)
         self.c.line(x1, y1, x2, y2)
         if dash is not None:
-            self.c.setDash([])  # 重置虚线样式
+            self.set_dash(None)  # 重置虚线样式
 
     def draw_string_list(self, x=0, y=0, r=0.0, g=0.0, b=0.0,
                          font="Helvetica", font_size=50,
@@ -111,8 +268,8 @@ class PDFDrawer:
             text_list = ["B4"]
 
         for item in text_list:
-            self.c.setFont(font, font_size)
-            self.c.setFillColorRGB(r, g, b)
+            self.set_font(font, font_size)
+            self.set_fill_color((r, g, b))
             if colon == ":":
                 self.c.drawString(x + 10,
                                   y + (text_list.index(item) +
@@ -133,8 +290,8 @@ class PDFDrawer:
         """绘制字符串"""
         if color is None:
             color = [0, 0, 0]
-        self.c.setFont(font, font_size)
-        self.c.setFillColorRGB(color[0], color[1], color[2], alpha=alpha)
+        self.set_font(font, font_size)
+        self.set_fill_color(color, alpha=alpha)
         self.c.drawString(x, y, text=text)
 
     def draw_rect(self, pos_x=0, pos_y=0, width=40, height=40,
@@ -143,9 +300,8 @@ class PDFDrawer:
         """绘制矩形"""
         if color is None:
             color = [0, 0, 0]
-        self.c.setFillColorRGB(color[0], color[1], color[2], alpha=alpha)
-        self.c.setStrokeColorRGB(
-            color[0], color[1], color[2], alpha=borderalpha)
+        self.set_fill_color(color, alpha=alpha)
+        self.set_stroke_color(color, alpha=borderalpha)
         self.c.roundRect(pos_x, pos_y, width, height,
                          radius=radius, stroke=stroke, fill=fill)
 
@@ -154,9 +310,9 @@ class PDFDrawer:
         """绘制圆圈"""
         if color is None:
             color = [0, 0, 0]
-        self.c.setStrokeColorRGB(color[0], color[1], color[2], alpha=alpha)
-        self.c.setFillColorRGB(color[0], color[1], color[2], alpha=alpha)
-        self.c.setLineWidth(line_width)
+        self.set_stroke_color(color, alpha=alpha)
+        self.set_fill_color(color, alpha=alpha)
+        self.set_line_width(line_width)
         self.c.circle(x, y, radius, stroke=stroke, fill=fill)
 
     def draw_dotted_line(self, x1, y1, x2, y2, width=1,
@@ -166,15 +322,15 @@ class PDFDrawer:
             color = [0, 0, 0]
         if dash is None:
             dash = [2, 1]
-        self.c.setStrokeColorRGB(color[0], color[1], color[2], alpha=alpha)
-        self.c.setLineWidth(width)
-        self.c.setDash(dash)
+        self.set_stroke_color(color, alpha=alpha)
+        self.set_line_width(width)
+        self.set_dash(dash)
         self.c.line(x1, y1, x2, y2)
 
     def draw_cut_rectangle(self, x, y, height, width, corner, alpha=1):
         """绘制切角矩形"""
-        self.c.setStrokeColorRGB(0, 0, 0, alpha=alpha)
-        self.c.setLineWidth(0.5)
+        self.set_stroke_color(Colors.BLACK, alpha=alpha)
+        self.set_line_width(0.5)
         p = self.c.beginPath()
         p.moveTo(x, y)
         p.lineTo(x, y + height - corner)
@@ -191,11 +347,9 @@ class PDFDrawer:
         """绘制只有一个圆角的矩形（右上角）"""
         if stroke_color is None:
             stroke_color = [0, 0, 0]
-        self.c.setStrokeColorRGB(stroke_color[0], stroke_color[1],
-                                 stroke_color[2], alpha=alpha)
+        self.set_stroke_color(stroke_color, alpha=alpha)
         if fill_color:
-            self.c.setFillColorRGB(fill_color[0], fill_color[1],
-                                   fill_color[2], alpha=alpha)
+            self.set_fill_color(fill_color, alpha=alpha)
 
         p = self.c.beginPath()
         p.moveTo(x, y)
@@ -241,7 +395,7 @@ class PDFDrawer:
             chinese_x, chinese_y, chinese_name, font="STSong-Light",
             font_size=font_size, color=Colors.DARK_BLUE)
 
-        self.c.setFont("STSong-Light", font_size)
+        self.set_font("STSong-Light", font_size)
         chinese_width = self.c.stringWidth(chinese_name, "STSong-Light",
                                            font_size)
         english_x = chinese_x + chinese_width + 3
@@ -267,7 +421,7 @@ class PDFDrawer:
 
         rect2_x = rect1_x
         rect2_y = rect1_y - (5)
-        self.c.setLineWidth(0)
+        self.set_line_width(0)
         self.draw_rounded_rect_one_corner(
             rect2_x, rect2_y, 5, 5, 1,
             stroke_color=[0, 0, 0], fill_color=[0.7, 0.7, 0.7])
@@ -275,10 +429,8 @@ class PDFDrawer:
         desc_x = chinese_x
         desc_y = rect_y - 2
 
-        style_sheet = getSampleStyleSheet()
-        desc_style = ParagraphStyle(
-            name="descstyle",
-            parent=style_sheet['Normal'],
+        desc_style = paragraph_styles.get(
+            "descstyle",
             alignment=TA_JUSTIFY,
             fontName="STSong-Light",
             fontSize=9,
@@ -430,6 +582,7 @@ class PDFGenerator:
     """PDF生成器主类"""
 
     def __init__(self, filename="output.pdf", pagesize=None):
+        """filename 可以是文件路径、可写的流（如 BytesIO），或 None 表示只在内存中生成"""
         self.filename = filename
         if pagesize is not None:
             self.c = canvas.Canvas(filename, pagesize=pagesize)
@@ -438,14 +591,56 @@ class PDFGenerator:
         self.drawer = PDFDrawer(self.c)
 
     def save(self):
-        """保存PDF文件"""
-        self.c.save()
-        print(f"PDF创建成功: {self.filename}")
+        """保存PDF文件
+
+        写入文件路径时打印提示；写入流或内存时不输出任何内容，返回PDF字节。
+        """
+        if self.filename is not None and not hasattr(self.filename, "write"):
+            self.c.save()
+            print(f"PDF创建成功: {self.filename}")
+            return None
+        data = self.c.getpdfdata()
+        if self.filename is not None:
+            self.filename.write(data)
+        return data
 
     def show_page(self):
         """显示新页面"""
         self.c.showPage()
 
+    def define_template(self, name, draw, bbox=None):
+        """将绘图回调录制为命名模板（PDF表单 XObject），文档中只保存一份
+
+        draw 接收 PDFDrawer，只在首次定义时调用；bbox 为 (x0, y0, x1, y1)，
+        默认整页。模板可以在任意页面、任意时刻定义。
+        """
+        if self.c.hasForm(name):
+            return name
+        x0, y0, x1, y1 = bbox if bbox is not None else (0, 0, None, None)
+        self.c.beginForm(name, x0, y0, x1, y1)
+        # 表单继承调用处的图形状态（字体除外，表单前导会设置默认字体），
+        # 所以录制时不能假设颜色、线宽等处于默认值；使用单独的绘图器，
+        # 页面绘图器的状态缓存不受影响
+        form_drawer = type(self.drawer)(self.c)
+        form_drawer.forget_state()
+        draw(form_drawer)
+        self.c.endForm()
+        return name
+
+    def has_template(self, name):
+        """模板是否已定义"""
+        return self.c.hasForm(name)
+
+    def use_template(self, name, x=0, y=0):
+        """在当前页面按引用绘制模板，可平移到 (x, y)"""
+        if x or y:
+            self.c.saveState()
+            self.c.translate(x, y)
+            self.c.doForm(name)
+            self.c.restoreState()
+        else:
+            self.c.doForm(name)
+
     def get_canvas(self):
         """获取Canvas对象"""
         return self.c
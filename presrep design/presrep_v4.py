@@ -3,9 +3,7 @@ import os
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import mm, cm
-from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import Paragraph
 from reportlab.lib.enums import TA_JUSTIFY, TA_LEFT
 from reportlab.lib import colors
@@ -14,6 +12,8 @@ from pdf_generate_api.roy_pdf_library import (
     PDFDrawer,
     Colors,
     create_pdf,
+    font_registry,
+    paragraph_styles,
 )
 
 # Change to the script's directory to ensure relative paths work
@@ -35,18 +35,18 @@ page_width = 210 * mm   # A4 width = 210 millimeters
 page_height = 297 * mm  # A4 height = 297 millimeters
 
 # Register custom fonts
-from reportlab.pdfbase.ttfonts import TTFont
+# Fonts are only listed here; each TTF is parsed the first time a page uses it
 
 # Register all fonts from 字体 folder
 font_base_path = "pdf_generate_api/字体/"
-pdfmetrics.registerFont(TTFont('FZLanTingXiHei', font_base_path + 'FZLTXHK 2.TTF'))  # 方正兰亭细黑
-pdfmetrics.registerFont(TTFont('FZLanTingTeHei', font_base_path + 'FZLTTHK.TTF'))  # 方正兰亭特黑 (Bold)
-pdfmetrics.registerFont(TTFont('FZLanTingCuHei', font_base_path + 'FZLTZCHJW.TTF'))  # 方正兰亭粗黑加粗
-pdfmetrics.registerFont(TTFont('FZLanTingChaoHei', font_base_path + 'FZLTCHK.ttf'))  # 方正兰亭超黑
-pdfmetrics.registerFont(TTFont('FZLanTingHei4', font_base_path + 'FZLTH4K.TTF'))  # 方正兰亭黑4
-# pdfmetrics.registerFont(TTFont('FZLanTingZhunHei', font_base_path + 'FZLTZHUNHK_0.otf'))  # 方正兰亭准黑 - OTF with PostScript outlines not supported
-pdfmetrics.registerFont(TTFont('FZTianYiSongK', font_base_path + 'FZTYSK.TTF'))  # 方正天一宋
-pdfmetrics.registerFont(TTFont('Impact', font_base_path + 'impact.ttf'))  # Impact
+font_registry.add('FZLanTingXiHei', font_base_path + 'FZLTXHK 2.TTF')  # 方正兰亭细黑
+font_registry.add('FZLanTingTeHei', font_base_path + 'FZLTTHK.TTF')  # 方正兰亭特黑 (Bold)
+font_registry.add('FZLanTingCuHei', font_base_path + 'FZLTZCHJW.TTF')  # 方正兰亭粗黑加粗
+font_registry.add('FZLanTingChaoHei', font_base_path + 'FZLTCHK.ttf')  # 方正兰亭超黑
+font_registry.add('FZLanTingHei4', font_base_path + 'FZLTH4K.TTF')  # 方正兰亭黑4
+# font_registry.add('FZLanTingZhunHei', font_base_path + 'FZLTZHUNHK_0.otf')  # 方正兰亭准黑 - OTF with PostScript outlines not supported
+font_registry.add('FZTianYiSongK', font_base_path + 'FZTYSK.TTF')  # 方正天一宋
+font_registry.add('Impact', font_base_path + 'impact.ttf')  # Impact
 
 # Define color constants
 deepblue = [49/255, 92/255, 170/255]  # RGB color for pentagon text
@@ -857,19 +857,15 @@ def draw_big_text(canvas_obj, x, y, text, width):
         text: text content to draw
         width: width of text box for wrapping
     """
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import Paragraph
-    from reportlab.lib.enums import TA_LEFT
-    from reportlab.lib import colors as reportlab_colors
-    
-    # Create paragraph style with specified font
-    style = ParagraphStyle(
-        name='CustomStyle',
+    # Get paragraph style with specified font (built once, shared by all calls)
+    style = paragraph_styles.get(
+        'CustomStyle',
+        parent=None,
         fontName='FZLanTingXiHei',
         fontSize=14,
         leading=14 * 1.2,  # leading = fontSize * 1.2
         alignment=TA_LEFT,
-        textColor=reportlab_colors.black,
+        textColor=colors.black,
     )
     
     # Create paragraph with text
@@ -886,13 +882,9 @@ def draw_paragraph_in_rect(canvas_obj, text, x, y, width, height, style=None):
     """
     Draw a paragraph within a rectangle area.
     """
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_LEFT
-
     if style is None:
-        default_style = ParagraphStyle(
-            name="Page9Paragraph",
-            parent=getSampleStyleSheet()['Normal'],
+        default_style = paragraph_styles.get(
+            "Page9Paragraph",
             fontName='FZLanTingXiHei',
             fontSize=12,
             leading=14,
@@ -1172,9 +1164,8 @@ for page_number in range(16):
         page9_rects.extend(draw_two_white_rect(drawer, 65, y_offset=5))
 
         page9_texts = [text_1, text_2, text_3, text_4, text_5, text_6]
-        paragraph_style = ParagraphStyle(
-            name="Page9ParagraphStyle",
-            parent=getSampleStyleSheet()['Normal'],
+        paragraph_style = paragraph_styles.get(
+            "Page9ParagraphStyle",
             fontName='FZLanTingXiHei',
             fontSize=12,
             leading=14,
@@ -1367,4 +1358,6 @@ for page_number in range(16):
 # This writes all the pages to the file on your computer
 pdf.save()
 print("PDF created successfully with 16 pages, A4 size, without ruler overlay!")
+for font_name, seconds in font_registry.report().items():
+    print(f"Loaded font {font_name} in {seconds * 1000:.0f} ms")
 
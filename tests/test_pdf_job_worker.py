@@ -1,10 +1,37 @@
 import asyncio
 import json
+import os
+import signal
+import tempfile
+import time
+from functools import partial
 from typing import Any, Dict, List, Optional
 
+import aiohttp
 from aiohttp import web
 
-from job_workers import PdfJobWorker, WorkerConfig
+from job_workers import (
+    CircuitBreakerRegistry,
+    LoadReporter,
+    LocalJobManager,
+    MemoryAdmission,
+    PdfJobWorker,
+    PendingResult,
+    PrefetchingFetcher,
+    PriorityJobBuffer,
+    RenderPool,
+    RendererRegistry,
+    ResultCache,
+    ResultSubmitter,
+    RetryPolicy,
+    WorkerConfig,
+    WorkerSupervisor,
+    build_worker,
+    default_registry,
+    leasing_job_fetcher,
+)
+from job_workers.loadtest import percentile, run_load_test
+from job_workers.serialization import dumps, loads_body, project
 
 
 class StubPdfJobWorker(PdfJobWorker):
@@ -21,13 +48,19 @@ class StubPdfJobWorker(PdfJobWorker):
         return True
 
     async def update_load(  # type: ignore[override]
-        self, *, current_jobs: int, cpu_usage: float, memory_usage: float
+        self,
+        *,
+        current_jobs: int,
+        cpu_usage: float,
+        memory_usage: float,
+        open_circuits: Optional[List[str]] = None,
     ) -> None:
         self.load_updates.append(
             {
                 "current_jobs": current_jobs,
                 "cpu_usage": cpu_usage,
                 "memory_usage": memory_usage,
+                "open_circuits": open_circuits,
             }
         )
 
@@ -38,7 +71,7 @@ class StubPdfJobWorker(PdfJobWorker):
         result: Optional[Dict[str, Any]],
         error: Optional[str],
         execution_time_ms: Optional[int] = None,
-    ) -> None:
+    ) -> bool:
         self.submitted_results.append(
             {
                 "job_id": job_id,
@@ -47,6 +80,7 @@ class StubPdfJobWorker(PdfJobWorker):
                 "execution_time_ms": execution_time_ms,
             }
         )
+        return True
 
 
 async def _start_mock_pdf_api() -> web.AppRunner:
@@ -80,7 +114,967 @@ async def _get_runner_port(runner: web.AppRunner) -> int:
     return sockets[0].getsockname()[1]
 
 
+async def _start_slow_pdf_api(delay: float, stats: Dict[str, int]) -> web.AppRunner:
+    async def handle_generate(request: web.Request) -> web.Response:
+        stats["in_flight"] += 1
+        stats["peak"] = max(stats["peak"], stats["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            stats["in_flight"] -= 1
+        return web.json_response({"pdf_url": "http://files.local/slow.pdf"})
+
+    app = web.Application()
+    app.router.add_post("/generate", handle_generate)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner
+
+
+async def check_concurrent_execution() -> None:
+    stats = {"in_flight": 0, "peak": 0}
+    runner = await _start_slow_pdf_api(0.2, stats)
+    worker: Optional[StubPdfJobWorker] = None
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        pending = [
+            {
+                "id": f"job-{index}",
+                "job_type": {
+                    "WebApiJob": {
+                        "url": pdf_url,
+                        "method": "POST",
+                        "headers": {"Content-Type": "application/json"},
+                        "body": json.dumps({"report_id": f"r{index}"}),
+                        "timeout": 10,
+                    }
+                },
+            }
+            for index in range(8)
+        ]
+
+        async def fetch(_worker: PdfJobWorker) -> Optional[Dict[str, Any]]:
+            return pending.pop(0) if pending else None
+
+        worker = StubPdfJobWorker(
+            job_manager_url="http://job-manager.local/api/v1/jobs",
+            worker_config=WorkerConfig(pdf_api_url=pdf_url),
+            max_concurrent_jobs=4,
+            job_fetcher=fetch,
+            poll_interval=0.05,
+            metrics_port=0,
+        )
+        await worker.start()
+
+        for _ in range(100):
+            if len(worker.submitted_results) == 8:
+                break
+            await asyncio.sleep(0.05)
+
+        assert len(worker.submitted_results) == 8, worker.submitted_results
+        assert all(item["error"] is None for item in worker.submitted_results)
+        assert stats["peak"] == 4, f"Expected 4 jobs in flight, saw {stats['peak']}"
+        pdf_api_stats = worker.connection_stats["pdf_api"]
+        assert pdf_api_stats.connections_created <= 4, pdf_api_stats
+        assert pdf_api_stats.connections_reused >= 4, pdf_api_stats
+
+        metrics_url = f"http://127.0.0.1:{worker._metrics_server.bound_port}/metrics"
+        async with aiohttp.ClientSession() as session:
+            async with session.get(metrics_url) as response:
+                assert response.status == 200
+                exposition = await response.text()
+        assert 'pdf_worker_jobs_total{status="completed"} 8' in exposition, exposition
+        assert 'pdf_worker_phase_seconds_count{phase="pdf_api"} 8' in exposition
+        assert 'pdf_worker_phase_seconds_count{phase="queue_wait"} 8' in exposition
+        assert 'pdf_worker_phase_seconds_count{phase="render"} 0' in exposition, "Phases are pre-registered"
+        try:
+            worker.metrics.observe_phase("pdf-api", 0.1)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Unknown phase labels should be rejected")
+        assert len(worker.load_updates) < 8, "Load updates should be coalesced, not per job"
+
+        print("PDF Job Worker concurrency test passed.")
+    finally:
+        if worker:
+            await worker.stop()
+        await runner.cleanup()
+
+
+async def check_renderer_opt_in() -> None:
+    assert len(default_registry) == 0, "No RustJob renderer may be registered by default"
+
+    manager = LocalJobManager()
+    await manager.start()
+    try:
+        for worker_id, renderer_modules in (("plain", ()), ("roy", ("job_workers.roy_renderer",))):
+            worker = build_worker(
+                worker_id,
+                job_manager_url=manager.url,
+                pdf_api_url="http://pdf.local/generate",
+                lease_jobs=True,
+                renderer_modules=renderer_modules,
+            )
+            await worker._ensure_sessions()
+            try:
+                assert await worker.register()
+            finally:
+                await worker.stop()
+    finally:
+        await manager.stop()
+
+    plain = manager.workers["plain"]["supported_job_types"]
+    roy = manager.workers["roy"]["supported_job_types"]
+    assert not any("RustJob" in job_type for job_type in plain), plain
+    assert {"RustJob": {"module": "roy_pdf_library", "function": "render_pages", "params": None}} in roy
+
+    from job_workers.roy_renderer import render_roy_pages
+
+    for op, args in (("upload_image", ["/etc/hostname", 0, 0]), ("save", []), ("no_such_op", [])):
+        try:
+            render_roy_pages({"pages": [[{"op": op, "args": args}]]})
+        except ValueError as exc:
+            assert "Unsupported PDFDrawer operation" in str(exc)
+        else:
+            raise AssertionError(f"{op} should be refused")
+
+    print("PDF Job Worker renderer opt-in test passed.")
+
+
+async def check_local_render_job(render_pool: Optional[RenderPool] = None) -> None:
+    with tempfile.TemporaryDirectory() as output_dir:
+        worker = StubPdfJobWorker(
+            job_manager_url="http://job-manager.local/api/v1/jobs",
+            worker_config=WorkerConfig(pdf_api_url="http://unused.local", output_dir=output_dir),
+            render_pool=render_pool,
+        )
+        await worker.start()
+        try:
+            await worker._handle_job(
+                {
+                    "id": "local-job-1",
+                    "job_type": {
+                        "RustJob": {
+                            "module": "roy_pdf_library",
+                            "function": "render_pages",
+                            "params": {
+                                "pagesize": [595, 960],
+                                "pages": [
+                                    [{"op": "draw_string", "kwargs": {"x": 100, "y": 700, "text": "Hi"}}],
+                                    [{"op": "draw_ruler", "args": [595, 960]}],
+                                ],
+                            },
+                        }
+                    },
+                }
+            )
+            await worker._handle_job(
+                {
+                    "id": "local-job-2",
+                    "job_type": {
+                        "RustJob": {
+                            "module": "roy_pdf_library",
+                            "function": "render_pages",
+                            "params": {"pages": [[{"op": "upload_image", "args": ["/etc/hostname", 0, 0]}]]},
+                        }
+                    },
+                }
+            )
+        finally:
+            await worker.stop()
+
+        result_payload, refused = worker.submitted_results
+        assert refused["error"] and "upload_image" in refused["error"], refused
+        assert result_payload["error"] is None, result_payload["error"]
+        local_response = result_payload["result"]["local_response"]
+        assert os.path.dirname(local_response["path"]) == output_dir
+        with open(local_response["path"], "rb") as handle:
+            assert handle.read(5) == b"%PDF-"
+        assert local_response["size_bytes"] == os.path.getsize(local_response["path"])
+
+    if render_pool is not None:
+        assert not render_pool.started, "Worker should shut its render pool down on stop"
+        print("PDF Job Worker render pool test passed.")
+    else:
+        print("PDF Job Worker local render test passed.")
+
+
+async def check_streamed_pdf_response() -> None:
+    pdf_body = b"%PDF-1.4\n" + b"0" * (256 * 1024)
+
+    async def handle_generate(request: web.Request) -> web.Response:
+        return web.Response(body=pdf_body, content_type="application/pdf")
+
+    async def handle_chunked_json(request: web.Request) -> web.StreamResponse:
+        # Chunked transfer encoding: the client sees no Content-Length.
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        await response.write(b'{"padding": "')
+        for _ in range(8):
+            await response.write(b"x" * (16 * 1024))
+        await response.write(b'"}')
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/generate", handle_generate)
+    app.router.add_post("/chunked", handle_chunked_json)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        with tempfile.TemporaryDirectory() as output_dir:
+            worker = StubPdfJobWorker(
+                job_manager_url="http://job-manager.local/api/v1/jobs",
+                worker_config=WorkerConfig(
+                    pdf_api_url=pdf_url,
+                    output_dir=output_dir,
+                    response_chunk_size=16 * 1024,
+                    max_response_bytes=512 * 1024,
+                ),
+            )
+            await worker._ensure_sessions()
+            job = {"WebApiJob": {"url": pdf_url, "method": "POST", "headers": {}, "body": "{}"}}
+            chunked_job = {"WebApiJob": dict(job["WebApiJob"], url=f"{pdf_url[:-len('/generate')]}/chunked")}
+            execute_job = worker.execute_job
+
+            async def execute_then_fail(job_data: Dict[str, Any]) -> Dict[str, Any]:
+                await execute_job(job_data)
+                raise RuntimeError("post-processing failed")
+
+            try:
+                await worker._handle_job({"id": "streamed", "job_type": job})
+                worker.execute_job = execute_then_fail  # type: ignore[method-assign]
+                await worker._handle_job({"id": "failed", "job_type": job})
+                worker.execute_job = execute_job  # type: ignore[method-assign]
+                await worker._handle_job({"id": "chunked", "job_type": chunked_job})
+                worker.worker_config.max_response_bytes = 64 * 1024
+                await worker._handle_job({"id": "too-large", "job_type": job})
+                await worker._handle_job({"id": "chunked-too-large", "job_type": chunked_job})
+            finally:
+                await worker.stop()
+
+            streamed, failed, chunked, too_large, chunked_too_large = worker.submitted_results
+            assert failed["error"] == "post-processing failed"
+            assert chunked["error"] is None, chunked["error"]
+            assert len(chunked["result"]["web_api_response"]["body"]["padding"]) == 8 * 16 * 1024
+            assert chunked_too_large["error"] and "max_response_bytes" in chunked_too_large["error"]
+            assert streamed["error"] is None, streamed["error"]
+            response = streamed["result"]["web_api_response"]
+            assert "body" not in response
+            assert response["size_bytes"] == len(pdf_body)
+            with open(response["path"], "rb") as handle:
+                assert handle.read() == pdf_body
+            assert too_large["error"] and "max_response_bytes" in too_large["error"]
+            assert sorted(os.listdir(output_dir)) == ["streamed.pdf"]
+    finally:
+        await runner.cleanup()
+
+    print("PDF Job Worker streamed response test passed.")
+
+
+async def check_retries_and_circuit_breaker() -> None:
+    calls = {"flaky": 0, "down": 0}
+
+    async def handle_flaky(request: web.Request) -> web.Response:
+        calls["flaky"] += 1
+        if calls["flaky"] < 3:
+            return web.Response(status=503, text="busy")
+        return web.json_response({"pdf_url": "http://files.local/flaky.pdf"})
+
+    async def handle_down(request: web.Request) -> web.Response:
+        calls["down"] += 1
+        return web.Response(status=500, text="broken")
+
+    app = web.Application()
+    app.router.add_post("/flaky", handle_flaky)
+    app.router.add_post("/down", handle_down)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    try:
+        port = await _get_runner_port(runner)
+        base_url = f"http://127.0.0.1:{port}"
+        worker = StubPdfJobWorker(
+            job_manager_url="http://job-manager.local/api/v1/jobs",
+            worker_config=WorkerConfig(pdf_api_url=f"{base_url}/flaky"),
+            retry_policy=RetryPolicy(max_retries=1, base_delay=0.01, max_delay=0.02),
+            circuit_breakers=CircuitBreakerRegistry(failure_threshold=3, reset_timeout=60),
+        )
+        await worker._ensure_sessions()
+
+        def job(path: str, max_retries: Optional[int] = None) -> Dict[str, Any]:
+            payload: Dict[str, Any] = {
+                "id": f"job-{path}",
+                "job_type": {"WebApiJob": {"url": f"{base_url}/{path}", "method": "POST", "headers": {}}},
+            }
+            if max_retries is not None:
+                payload["max_retries"] = max_retries
+            return payload
+
+        try:
+            await worker._handle_job(job("flaky", max_retries=3))
+            await worker._handle_job(job("down"))
+            await worker._handle_job(job("down"))
+            await worker._load_reporter.flush()
+        finally:
+            await worker.stop()
+
+        flaky, first_down, second_down = worker.submitted_results
+        assert flaky["error"] is None, flaky["error"]
+        assert flaky["result"]["web_api_response"]["attempts"] == 3
+        assert first_down["error"] and "500" in first_down["error"]
+        assert second_down["error"] and "Circuit open" in second_down["error"]
+        assert calls["down"] == 3, calls
+        assert worker.load_updates[-1]["open_circuits"] == [f"{base_url}/down"]
+    finally:
+        await runner.cleanup()
+
+    print("PDF Job Worker retry/circuit breaker test passed.")
+
+
+async def check_throttled_half_open_probe() -> None:
+    statuses = [500, 429, 200]
+
+    async def handle(request: web.Request) -> web.Response:
+        status = statuses.pop(0)
+        if status != 200:
+            return web.Response(status=status, text="unavailable")
+        return web.json_response({"pdf_url": "http://files.local/recovered.pdf"})
+
+    app = web.Application()
+    app.router.add_post("/generate", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    try:
+        port = await _get_runner_port(runner)
+        url = f"http://127.0.0.1:{port}/generate"
+        registry = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=0.05)
+        worker = StubPdfJobWorker(
+            job_manager_url="http://job-manager.local/api/v1/jobs",
+            worker_config=WorkerConfig(pdf_api_url=url),
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breakers=registry,
+        )
+        await worker._ensure_sessions()
+        job = {"job_type": {"WebApiJob": {"url": url, "method": "POST", "headers": {}}}}
+        try:
+            for index in range(3):
+                await asyncio.sleep(0.06)
+                await worker._handle_job({"id": f"probe-{index}", **job})
+        finally:
+            await worker.stop()
+
+        opened, throttled, recovered = worker.submitted_results
+        assert opened["error"] and "500" in opened["error"]
+        assert throttled["error"] and "429" in throttled["error"]
+        assert recovered["error"] is None, recovered["error"]
+        assert registry.open_circuits() == []
+    finally:
+        await runner.cleanup()
+
+    print("PDF Job Worker throttled half-open probe test passed.")
+
+
+async def check_result_spooling() -> None:
+    delivered: List[str] = []
+    accept = False
+
+    async def send(item: PendingResult) -> bool:
+        if accept:
+            delivered.append(item.job_id)
+        return accept
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spool_path = os.path.join(spool_dir, "results.jsonl")
+        submitter = ResultSubmitter(send, max_attempts=2, retry_delay=0.01, spool_path=spool_path)
+        await submitter.start()
+        for index in range(3):
+            await submitter.put(PendingResult(f"job-{index}", {"ok": True}, None, 5))
+        await submitter.stop(timeout=1.0)
+        with open(spool_path, "r", encoding="utf-8") as handle:
+            assert len(handle.readlines()) == 3
+
+        accept = True
+        await submitter.start()
+        await submitter.stop(timeout=1.0)
+        assert sorted(delivered) == ["job-0", "job-1", "job-2"], delivered
+        assert not os.path.exists(spool_path)
+
+    print("PDF Job Worker result spooling test passed.")
+
+
+async def check_load_reporter_thresholds() -> None:
+    published: List[float] = []
+
+    async def publish() -> None:
+        published.append(time.monotonic())
+
+    reporter = LoadReporter(
+        publish, capacity=2, min_interval=60.0, heartbeat_interval=60.0, settle_interval=0.05
+    )
+    task = asyncio.create_task(reporter.run())
+    try:
+        await asyncio.sleep(0.02)
+        assert len(published) == 1, "The initial state is reported right away"
+
+        reporter.record(1)  # idle -> busy, once it has settled
+        await asyncio.sleep(0.02)
+        assert len(published) == 1, published
+        await asyncio.sleep(0.05)
+        assert len(published) == 2, published
+        reporter.record(2)  # busy -> full, right away
+        await asyncio.sleep(0.01)
+        assert len(published) == 3, published
+        reporter.record(1)  # full -> busy: capacity is free again
+        await asyncio.sleep(0.08)
+        assert len(published) == 4, published
+
+        reporter.record(1)  # same level, coalesced until min_interval
+        await asyncio.sleep(0.08)
+        assert len(published) == 4, published
+
+        # A saturated worker refills each finished slot at once; that is not news.
+        reporter.record(2)
+        await asyncio.sleep(0.01)
+        assert len(published) == 5, published
+        for _ in range(200):
+            reporter.record(1)
+            await asyncio.sleep(0.001)
+            reporter.record(2)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.08)
+        assert len(published) == 5, published
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    print("PDF Job Worker load reporter threshold test passed.")
+
+
+async def check_prefetch_backoff() -> None:
+    queued: List[Dict[str, Any]] = []
+    polls = {"count": 0}
+
+    async def fetch() -> Optional[Dict[str, Any]]:
+        polls["count"] += 1
+        return queued.pop(0) if queued else None
+
+    fetcher = PrefetchingFetcher(
+        fetch, lambda: 1, prefetch=2, poll_interval=0.01, max_poll_interval=0.04
+    )
+    task = asyncio.create_task(fetcher.run())
+    try:
+        await asyncio.sleep(0.2)
+        assert fetcher.current_delay == 0.04, fetcher.current_delay
+        assert polls["count"] < 10, "Idle polling should back off"
+
+        queued.extend({"id": f"job-{index}"} for index in range(5))
+        first = await asyncio.wait_for(fetcher.get(), timeout=1.0)
+        assert first["id"] == "job-0"
+        await asyncio.sleep(0.05)
+        assert len(fetcher.buffer) == 3, "Expected free slots + prefetch jobs buffered"
+        assert fetcher.current_delay == 0.01, "A hit should reset the idle backoff"
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    # An idle worker must not sit out long stretches before it sees new work.
+    assert PrefetchingFetcher(fetch, lambda: 1).max_poll_interval <= 5.0
+    worker = build_worker(
+        "poll", job_manager_url="http://job-manager.local", lease_jobs=True, max_poll_interval=3.0
+    )
+    assert worker._fetcher.max_poll_interval == 3.0
+    try:
+        build_worker("idle", job_manager_url="http://job-manager.local")
+    except ValueError as exc:
+        assert "no job source" in str(exc)
+    else:
+        raise AssertionError("A worker without a job source should be refused")
+
+    print("PDF Job Worker prefetch test passed.")
+
+
+async def check_priority_dispatch() -> None:
+    executed: List[str] = []
+    registry = RendererRegistry()
+
+    @registry.register("tests", "record")
+    def record(params: Dict[str, Any]) -> Dict[str, Any]:
+        executed.append(params["name"])
+        time.sleep(params.get("hold", 0.0))
+        return {"name": params["name"]}
+
+    def job(name: str, priority: str, hold: float = 0.0) -> Dict[str, Any]:
+        return {
+            "id": name,
+            "priority": priority,
+            "job_type": {
+                "RustJob": {"module": "tests", "function": "record", "params": {"name": name, "hold": hold}}
+            },
+        }
+
+    queued = [
+        job("busy", "Normal", hold=0.3),
+        job("low-1", "Low"),
+        job("low-2", "Low"),
+        job("high", "High"),
+    ]
+
+    async def fetch(_worker: PdfJobWorker) -> Optional[Dict[str, Any]]:
+        # Later jobs only show up once "busy" occupies the single slot.
+        if queued and (executed or queued[0]["id"] == "busy"):
+            return queued.pop(0)
+        return None
+
+    worker = StubPdfJobWorker(
+        job_manager_url="http://job-manager.local/api/v1/jobs",
+        worker_config=WorkerConfig(pdf_api_url="http://unused.local"),
+        max_concurrent_jobs=1,
+        job_fetcher=fetch,
+        poll_interval=0.01,
+        max_poll_interval=0.05,
+        renderers=registry,
+        # The default prefetch of one would hold only "low-1" while "busy" runs.
+        prefetch_jobs=3,
+    )
+    await worker.start()
+    try:
+        for _ in range(200):
+            if len(worker.submitted_results) == 4:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await worker.stop()
+
+    assert executed == ["busy", "high", "low-1", "low-2"], executed
+
+    # Priority scheduling must not lease more than the configured prefetch.
+    fetched: List[str] = []
+
+    async def endless_fetch(_worker: PdfJobWorker) -> Optional[Dict[str, Any]]:
+        fetched.append(f"job-{len(fetched)}")
+        return job(fetched[-1], "Normal", hold=0.2)
+
+    worker = StubPdfJobWorker(
+        job_manager_url="http://job-manager.local/api/v1/jobs",
+        worker_config=WorkerConfig(pdf_api_url="http://unused.local"),
+        max_concurrent_jobs=1,
+        job_fetcher=endless_fetch,
+        poll_interval=0.01,
+        renderers=registry,
+        prefetch_jobs=1,
+    )
+    await worker.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert len(fetched) == 2, fetched  # one running, one buffered
+    finally:
+        await worker.stop()
+
+    print("PDF Job Worker priority dispatch test passed.")
+
+
+def check_priority_buffer() -> None:
+    now = {"value": 0.0}
+    buffer = PriorityJobBuffer(aging_interval=10.0, clock=lambda: now["value"])
+    buffer.put({"id": "bulk-1", "priority": "Low"})
+    buffer.put({"id": "bulk-2", "priority": "Low"})
+    buffer.put({"id": "normal"})
+    buffer.put({"id": "urgent", "priority": "Urgent"})
+
+    assert buffer.pop()["id"] == "urgent"
+    assert buffer.pop()["id"] == "normal"
+
+    buffer.put({"id": "high", "priority": "High"})
+    now["value"] = 25.0
+    buffer.put({"id": "late-high", "priority": "High"})
+    # The Low jobs have aged by 2.5 levels: they beat a fresh High job, not an aged one.
+    assert [buffer.pop()["id"] for _ in range(3)] == ["high", "bulk-1", "bulk-2"]
+    assert [job["id"] for job in buffer.drain()] == ["late-high"]
+
+    print("PDF Job Worker priority scheduling test passed.")
+
+
+async def check_graceful_drain() -> None:
+    stats = {"in_flight": 0, "peak": 0}
+    runner = await _start_slow_pdf_api(0.2, stats)
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        pending = [
+            {"id": f"drain-{index}", "job_type": {"WebApiJob": {"url": pdf_url, "method": "POST", "headers": {}}}}
+            for index in range(3)
+        ]
+
+        async def fetch(_worker: PdfJobWorker) -> Optional[Dict[str, Any]]:
+            return pending.pop(0) if pending else None
+
+        worker = StubPdfJobWorker(
+            job_manager_url="http://job-manager.local/api/v1/jobs",
+            worker_config=WorkerConfig(pdf_api_url=pdf_url),
+            max_concurrent_jobs=2,
+            job_fetcher=fetch,
+            poll_interval=0.05,
+        )
+        await worker.start()
+        while stats["in_flight"] < 2:
+            await asyncio.sleep(0.01)
+
+        await worker.stop(drain=True, drain_timeout=5.0)
+
+        finished = sorted(item["job_id"] for item in worker.submitted_results)
+        assert finished == ["drain-0", "drain-1", "drain-2"], finished
+        assert all(item["error"] is None for item in worker.submitted_results)
+        assert any(update["current_jobs"] == 2 for update in worker.load_updates)
+    finally:
+        await runner.cleanup()
+
+    print("PDF Job Worker graceful drain test passed.")
+
+
+async def check_result_cache() -> None:
+    calls = {"count": 0}
+
+    async def handle_generate(request: web.Request) -> web.Response:
+        calls["count"] += 1
+        payload = await request.json()
+        return web.json_response({"pdf_url": f"http://files.local/{payload['report_id']}.pdf"})
+
+    app = web.Application()
+    app.router.add_post("/generate", handle_generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for cache in (ResultCache(disk_dir=cache_dir), ResultCache(disk_dir=cache_dir)):
+                worker = StubPdfJobWorker(
+                    job_manager_url="http://job-manager.local/api/v1/jobs",
+                    worker_config=WorkerConfig(pdf_api_url=pdf_url),
+                    result_cache=cache,
+                )
+                await worker._ensure_sessions()
+                try:
+                    for body in ('{"report_id": "r1", "grade": 11}', '{"grade": 11, "report_id": "r1"}'):
+                        job = {"WebApiJob": {"url": pdf_url, "method": "post", "headers": {}, "body": body}}
+                        await worker._handle_job({"id": "cached", "job_type": job})
+                finally:
+                    await worker.stop()
+
+                responses = [item["result"]["web_api_response"] for item in worker.submitted_results]
+                assert all(item["pdf_url"] == "http://files.local/r1.pdf" for item in responses)
+                assert responses[-1]["cache_hit"] is True
+
+        assert calls["count"] == 1, "Identical requests should reach the PDF API once"
+    finally:
+        await runner.cleanup()
+
+    print("PDF Job Worker result cache test passed.")
+
+
+async def check_local_job_manager() -> None:
+    stats = {"in_flight": 0, "peak": 0}
+    runner = await _start_slow_pdf_api(0.05, stats)
+    manager = LocalJobManager(latency=0.002, lease_timeout=0.3)
+    await manager.start()
+    worker: Optional[PdfJobWorker] = None
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        web_job = {"WebApiJob": {"url": pdf_url, "method": "POST", "headers": {}, "body": "{}"}}
+
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{manager.url}/jobs", json={"job_type": web_job}) as response:
+                assert response.status == 200
+                created = await response.json()
+            for data in (b"not json", b"[1, 2]"):
+                async with session.post(f"{manager.url}/jobs", data=data) as response:
+                    assert response.status == 400, response.status
+                    assert "JSON object" in (await response.json())["error"]
+        manager.enqueue(web_job, priority="Low")
+        manager.enqueue(web_job, priority="Urgent")
+
+        # A lease that is never completed is handed out again once it expires.
+        abandoned = manager.enqueue(web_job, max_retries=1)
+        assert manager.lease("crashed-worker")["priority"] == "Urgent"
+        manager.jobs[created["job_id"]]["status"] = "Pending"
+        assert manager.lease("crashed-worker")["id"] == created["job_id"]
+        assert manager.lease("crashed-worker")["id"] == abandoned["id"]
+        await asyncio.sleep(0.5)
+        assert manager.jobs[abandoned["id"]]["retry_count"] == 1
+        assert manager.jobs[created["job_id"]]["status"] == "Timeout"
+
+        worker = PdfJobWorker(
+            job_manager_url=manager.url,
+            worker_config=WorkerConfig(pdf_api_url=pdf_url, result_fields=("status_code", "pdf_url")),
+            max_concurrent_jobs=2,
+            job_fetcher=leasing_job_fetcher,
+            poll_interval=0.02,
+        )
+        await worker.start()
+        await manager.wait_until_finished(len(manager.jobs), timeout=5.0)
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{manager.url}/jobs/{abandoned['id']}/result") as response:
+                result = await response.json()
+            async with session.get(f"{manager.url}/workers") as response:
+                workers = await response.json()
+        assert result["status"] == "Completed", result
+        web_api_response = json.loads(result["result"])["web_api_response"]
+        assert web_api_response == {"status_code": 200, "pdf_url": "http://files.local/slow.pdf"}
+        assert workers[0]["id"] == worker.worker_id and workers[0]["is_online"]
+        assert manager.request_counts["POST /workers/{id}/lease"] >= 2
+        assert manager.request_counts["POST /jobs/{id}/result"] == 2
+    finally:
+        if worker:
+            await worker.stop()
+        await manager.stop()
+        await runner.cleanup()
+
+    print("PDF Job Worker local Job Manager test passed.")
+
+
+async def check_supervisor() -> None:
+    stats = {"in_flight": 0, "peak": 0}
+    runner = await _start_slow_pdf_api(0.01, stats)
+    manager = LocalJobManager()
+    await manager.start()
+    supervisor: Optional[WorkerSupervisor] = None
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        supervisor = WorkerSupervisor(
+            partial(
+                build_worker,
+                job_manager_url=manager.url,
+                pdf_api_url=pdf_url,
+                lease_jobs=True,
+                poll_interval=0.05,
+                max_poll_interval=0.2,
+            ),
+            processes=2,
+            worker_id_prefix="render-box",
+            restart_delay=0.1,
+            monitor_interval=0.05,
+            drain_timeout=5.0,
+            metrics_port=0,
+        )
+        await supervisor.start()
+        for index in range(10):
+            manager.enqueue({"WebApiJob": {"url": pdf_url, "method": "POST", "headers": {}, "body": "{}"}})
+        await manager.wait_until_finished(10, timeout=60.0)
+        assert sorted(manager.workers) == ["render-box-0", "render-box-1"], manager.workers
+
+        crashed_pid = supervisor.pids()["render-box-1"]
+        os.kill(crashed_pid, signal.SIGKILL)
+        for _ in range(600):
+            pid = supervisor.pids()["render-box-1"]
+            if pid != crashed_pid and supervisor.alive_count() == 2:
+                break
+            await asyncio.sleep(0.05)
+        assert supervisor.pids()["render-box-1"] != crashed_pid, "Crashed child should be restarted"
+
+        metrics_url = f"http://127.0.0.1:{supervisor.metrics_bound_port}/metrics"
+        async with aiohttp.ClientSession() as session:
+            for _ in range(600):
+                async with session.get(metrics_url) as response:
+                    exposition = await response.text()
+                if 'worker_id="render-box-1"' in exposition and 'worker_id="render-box-0"' in exposition:
+                    break
+                await asyncio.sleep(0.05)
+        assert 'pdf_worker_current_jobs{worker_id="render-box-0"}' in exposition, exposition
+        assert "pdf_supervisor_restarts_total 1" in exposition, exposition
+
+        processes = [slot.process for slot in supervisor._slots]
+        await supervisor.stop()
+        assert all(process is not None and process.exitcode == 0 for process in processes)
+        supervisor = None
+    finally:
+        if supervisor:
+            await supervisor.stop()
+        await manager.stop()
+        await runner.cleanup()
+
+    print("PDF Job Worker supervisor test passed.")
+
+
+def check_serialization() -> None:
+    nested = {"status_code": 200, "body": {"report_id": "r1", "pages": [1, 2]}, "headers": {}}
+    assert project(nested, ("status_code", "body.report_id", "missing.key")) == {
+        "status_code": 200,
+        "body": {"report_id": "r1"},
+    }
+    assert project(nested, None) is nested
+    assert loads_body(dumps({"name": "张三"}), None) == {"name": "张三"}
+    assert loads_body('{"name": "张三"}'.encode("gb18030"), "GB18030") == {"name": "张三"}
+    assert loads_body(b"<html>busy</html>", "utf-8") == "<html>busy</html>"
+    assert loads_body(dumps({"name": "张三"}), "x-unknown") == {"name": "张三"}
+    assert loads_body(b"plain \xff", "x-unknown") == "plain \ufffd"
+
+    print("PDF Job Worker serialization test passed.")
+
+
+async def check_callback_delivery() -> None:
+    stats = {"in_flight": 0, "peak": 0}
+    runner = await _start_slow_pdf_api(0.1, stats)
+    manager = LocalJobManager()
+    await manager.start()
+    worker: Optional[PdfJobWorker] = None
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        worker = PdfJobWorker(
+            job_manager_url=manager.url,
+            worker_config=WorkerConfig(pdf_api_url=pdf_url),
+            max_concurrent_jobs=1,
+            prefetch_jobs=0,
+            callback_port=0,
+        )
+        await worker.start()
+        assert manager.workers[worker.worker_id]["callback_url"] == worker.callback_url
+
+        async with aiohttp.ClientSession() as session:
+            async with session.post(worker.callback_url, json={"job_type": {}}) as response:
+                assert response.status == 400
+
+        for _ in range(3):
+            manager.enqueue({"WebApiJob": {"url": pdf_url, "method": "POST", "headers": {}, "body": "{}"}})
+        await manager.wait_until_finished(3, timeout=10.0)
+
+        assert all(job["status"] == "Completed" for job in manager.jobs.values())
+        assert stats["peak"] == 1, "Pushes beyond the free slots should be refused"
+        assert worker.metrics.pushed_jobs.value({"outcome": "accepted"}) == 3
+        assert worker.metrics.pushed_jobs.value({"outcome": "rejected"}) >= 1
+        assert "POST /workers/{id}/lease" not in manager.request_counts
+    finally:
+        if worker:
+            await worker.stop()
+        await manager.stop()
+        await runner.cleanup()
+
+    print("PDF Job Worker callback delivery test passed.")
+
+
+async def check_memory_admission() -> None:
+    megabyte = 1024 * 1024
+    stats = {"in_flight": 0, "peak": 0}
+    runner = await _start_slow_pdf_api(0.1, stats)
+    worker: Optional[StubPdfJobWorker] = None
+    try:
+        port = await _get_runner_port(runner)
+        pdf_url = f"http://127.0.0.1:{port}/generate"
+        pending = [
+            {"id": f"big-{index}", "job_type": {"WebApiJob": {"url": pdf_url, "method": "POST", "headers": {}}}}
+            for index in range(3)
+        ]
+
+        async def fetch(_worker: PdfJobWorker) -> Optional[Dict[str, Any]]:
+            return pending.pop(0) if pending else None
+
+        # Every in-flight request costs 70 MB on top of a 100 MB baseline.
+        admission = MemoryAdmission(
+            200 * megabyte,
+            rss_reader=lambda: (100 + 70 * stats["in_flight"]) * megabyte,
+            default_estimate=60 * megabyte,
+            sample_interval=0.01,
+        )
+        worker = StubPdfJobWorker(
+            job_manager_url="http://job-manager.local/api/v1/jobs",
+            worker_config=WorkerConfig(pdf_api_url=pdf_url),
+            max_concurrent_jobs=3,
+            job_fetcher=fetch,
+            poll_interval=0.02,
+            memory_admission=admission,
+        )
+        await worker.start()
+        for _ in range(200):
+            if len(worker.submitted_results) == 3:
+                break
+            await asyncio.sleep(0.02)
+
+        assert len(worker.submitted_results) == 3, worker.submitted_results
+        assert stats["peak"] == 1, f"Memory budget should serialise jobs, saw {stats['peak']}"
+        assert worker.metrics.admission_refusals.value() >= 1
+        assert admission.estimate({"job_type": {"WebApiJob": {"url": pdf_url}}}) >= 70 * megabyte
+        assert admission.running() == 0
+    finally:
+        if worker:
+            await worker.stop()
+        await runner.cleanup()
+
+    oversized = MemoryAdmission(megabyte, rss_reader=lambda: 0, default_estimate=2 * megabyte)
+    assert oversized.try_admit("alone", {"job_type": {}}), "An idle worker admits oversized jobs"
+    assert not oversized.try_admit("second", {"job_type": {}})
+
+    # Jobs without an id get one unique id, shared by admission and result submission.
+    roomy = MemoryAdmission(1024 * megabyte, rss_reader=lambda: 0, default_estimate=megabyte)
+    anonymous = StubPdfJobWorker(
+        job_manager_url="http://job-manager.local/api/v1/jobs", memory_admission=roomy
+    )
+    first, second = {"job_type": {}}, {"job_type": {}}
+    assert anonymous._admit(first) and anonymous._admit(second)
+    assert roomy.running() == 2 and first["id"] != second["id"]
+    anonymous._on_job_done(first["id"])
+    assert roomy.running() == 1
+
+    print("PDF Job Worker memory admission test passed.")
+
+
+async def check_load_test_harness() -> None:
+    assert percentile([0.3, 0.1, 0.2, 0.4], 50) == 0.2
+    assert percentile([0.3, 0.1, 0.2, 0.4], 99) == 0.4
+
+    report = await run_load_test(
+        workers=2, jobs=20, max_concurrent_jobs=2, service_time=0.01, distribution="uniform", seed=7
+    )
+    assert report.completed == 20 and report.failed == 0, report
+    assert report.pdf_api_requests == 20
+    assert report.jobs_per_second > 0
+    assert 0 < report.latency_p50 <= report.latency_p95 <= report.latency_p99 <= report.latency_max
+    assert report.control_plane_requests["POST /jobs"] == 20
+    assert report.control_plane_requests["POST /jobs/{id}/result"] == 20
+
+    print("PDF Job Worker load test harness passed.")
+
+
 async def main() -> None:
+    # Runs first: it checks that nothing has registered a renderer yet.
+    await check_renderer_opt_in()
+    await check_concurrent_execution()
+    await check_local_job_manager()
+    await check_callback_delivery()
+    await check_load_test_harness()
+    await check_memory_admission()
+    check_serialization()
+    await check_supervisor()
+    await check_result_cache()
+    await check_graceful_drain()
+    check_priority_buffer()
+    await check_priority_dispatch()
+    await check_load_reporter_thresholds()
+    await check_prefetch_backoff()
+    await check_result_spooling()
+    await check_retries_and_circuit_breaker()
+    await check_throttled_half_open_probe()
+    await check_streamed_pdf_response()
+    await check_local_render_job()
+    await check_local_render_job(RenderPool(max_workers=2, renderer_modules=("job_workers.roy_renderer",)))
+
     runner = await _start_mock_pdf_api()
     worker: Optional[StubPdfJobWorker] = None
     try:
@@ -121,6 +1115,11 @@ async def main() -> None:
         web_api_response = result_payload["result"]["web_api_response"]
         assert web_api_response["status_code"] == 200
         assert web_api_response["pdf_url"] == "http://files.local/demo_report.pdf"
+        await worker._load_reporter.flush()
+        assert worker.load_updates, "Expected a load update after flushing"
+        for update in worker.load_updates:
+            assert 0.0 <= update["cpu_usage"] <= 100.0
+            assert 0.0 <= update["memory_usage"] <= 100.0
 
         print("PDF Job Worker integration test passed.")
     finally:
@@ -0,0 +1,186 @@
+import contextlib
+import io
+import os
+
+from reportlab.pdfgen import canvas
+
+from reportlab.platypus import Paragraph
+
+from roy_pdf_library import Colors, PDFDrawer, PDFGenerator, font_registry, paragraph_styles
+
+
+FONT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "presrep design", "pdf_generate_api", "字体")
+
+
+def _page_code(canvas_obj: canvas.Canvas) -> str:
+    return "\n".join(canvas_obj._code)
+
+
+def _font_changes(canvas_obj: canvas.Canvas) -> int:
+    # setFont emits a bare "BT /Fn size Tf leading TL ET"; drawString's own text objects
+    # carry a text matrix as well.
+    return sum(1 for line in canvas_obj._code if line.startswith("BT /"))
+
+
+def check_graphics_state_cache() -> None:
+    c = canvas.Canvas(io.BytesIO(), pagesize=(595, 960))
+    drawer = PDFDrawer(c)
+
+    drawer.draw_bulletin(["推理能力", "空间能力", "加工速度"])
+    code = _page_code(c)
+    assert _font_changes(c) == 1, "draw_bulletin should set its font once"
+    assert code.count(" w") == 1, "draw_bulletin should set its line width once"
+
+    del c._code[:]
+    drawer.draw_string(10, 10, text="a", font_size=8, color=Colors.RED)
+    drawer.draw_string(10, 20, text="b", font_size=8, color=Colors.RED)
+    code = _page_code(c)
+    assert _font_changes(c) == 1 and code.count(" rg") == 1, code
+
+    # restoreState brings back the outer state, so the next change must be emitted again.
+    c.saveState()
+    drawer.draw_string(10, 30, text="c", font_size=9, color=Colors.CYAN)
+    drawer.set_dash([2, 1])
+    c.restoreState()
+    assert (c._fontsize, c._fillColorObj, c._lineDash) == (8, tuple(Colors.RED), None)
+    del c._code[:]
+    drawer.draw_string(10, 40, text="d", font_size=9, color=Colors.CYAN)
+    drawer.draw_line(0, 0, 10, 10, dash=[2, 1])
+    code = _page_code(c)
+    assert _font_changes(c) == 1 and code.count(" rg") == 1, code
+    assert "[2 1] 0 d" in code and "[] 0 d" in code, code
+
+    # A new page starts from the default graphics state.
+    drawer.draw_dotted_line(0, 0, 10, 10)
+    c.showPage()
+    assert c._lineDash is None
+    drawer.draw_dotted_line(0, 0, 10, 10)
+    assert "[2 1] 0 d" in _page_code(c)
+
+    print("Roy PDF library graphics state cache test passed.")
+
+
+def _ruler_proof(pages: int, use_template: bool) -> bytes:
+    pdf = PDFGenerator(None, pagesize=(595, 960))
+    drawer = pdf.get_drawer()
+    for index in range(pages):
+        if index:
+            pdf.show_page()
+        drawer.draw_string(20, 900, text=f"page {index + 1}", font_size=12, color=Colors.RED)
+        if use_template:
+            pdf.define_template("ruler", lambda d: d.draw_ruler(595, 960))
+            pdf.use_template("ruler")
+        else:
+            drawer.draw_ruler(595, 960)
+    return pdf.save()
+
+
+def check_templates() -> None:
+    inline = _ruler_proof(16, use_template=False)
+    stamped = _ruler_proof(16, use_template=True)
+    assert stamped.count(b"/Subtype /Form") == 1
+    assert len(stamped) * 3 < len(inline), (len(stamped), len(inline))
+
+    # Forms inherit the caller's graphics state, so recording must not rely on defaults.
+    pdf = PDFGenerator(io.BytesIO())
+    c = pdf.get_canvas()
+    pdf.drawer.draw_rect(0, 0, 10, 10, color=Colors.RED)
+    form_code: list = []
+
+    def draw_box(form_drawer: PDFDrawer) -> None:
+        form_drawer.draw_rect(0, 0, 5, 5, color=Colors.BLACK)
+        form_code.extend(form_drawer.c._code)
+
+    pdf.define_template("box", draw_box)
+    assert "0 0 0 rg" in form_code, form_code
+    assert c._fillColorObj == tuple(Colors.RED), "Defining a template must not disturb the page"
+    assert pdf.define_template("box", None) == "box" and pdf.has_template("box")
+    pdf.use_template("box", 100, 100)
+
+    # ReportLab's own drawing code reads the canvas state while recording a template.
+    def draw_note(form_drawer: PDFDrawer) -> None:
+        note = Paragraph("<u>underlined</u> and <strike>struck</strike>", paragraph_styles.get("note"))
+        note.wrapOn(form_drawer.c, 200, 50)
+        note.drawOn(form_drawer.c, 10, 10)
+        form_drawer.draw_rect(0, 0, 5, 5, color=Colors.RED)
+
+    pdf.define_template("note", draw_note)
+    pdf.use_template("note")
+    pdf.drawer.forget_state()
+    draw_note(pdf.drawer)
+    assert c._fillColorObj == tuple(Colors.RED) and c._lineWidth == 1
+    assert pdf.save().startswith(b"%PDF-")
+
+    print("Roy PDF library template test passed.")
+
+
+def check_stream_output() -> None:
+    stdout = io.StringIO()
+    with contextlib.redirect_stdout(stdout):
+        in_memory = PDFGenerator(None)
+        in_memory.get_drawer().draw_string(100, 700, text="Hello", font_size=20)
+        data = in_memory.save()
+
+        stream = io.BytesIO()
+        streamed = PDFGenerator(stream)
+        streamed.get_drawer().draw_string(100, 700, text="Hello", font_size=20)
+        assert streamed.save() == stream.getvalue()
+
+    assert data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF")
+    assert stdout.getvalue() == "", "Stream output must not print"
+
+    print("Roy PDF library stream output test passed.")
+
+
+def check_paragraph_styles() -> None:
+    count = len(paragraph_styles)
+    body = paragraph_styles.get("body", fontName="STSong-Light", fontSize=9, leading=13)
+    assert paragraph_styles.get("body", leading=13, fontSize=9, fontName="STSong-Light") is body
+    assert paragraph_styles.get("body", fontName="STSong-Light", fontSize=10, leading=13) is not body
+    assert body.parent is paragraph_styles.sample()["Normal"] and body.fontSize == 9
+    assert paragraph_styles.get("plain", parent=None).parent is None
+    assert len(paragraph_styles) == count + 3
+
+    print("Roy PDF library paragraph style registry test passed.")
+
+
+def check_font_registry() -> None:
+    assert "STSong-Light" in font_registry
+    assert not font_registry.is_loaded("STSong-Light"), "Fonts must not load at import"
+
+    font_registry.add("TestImpact", os.path.join(FONT_DIR, "impact.ttf"))
+    assert not font_registry.is_loaded("TestImpact")
+
+    pdf = PDFGenerator(None)
+    drawer = pdf.get_drawer()
+    drawer.draw_string(10, 10, font="TestImpact", font_size=12, text="42")
+    para = Paragraph("中文<b>粗体</b>", paragraph_styles.get("cjk", fontName="STSong-Light"))
+    para.wrapOn(pdf.get_canvas(), 200, 100)
+    para.drawOn(pdf.get_canvas(), 10, 100)
+    assert pdf.save().startswith(b"%PDF-")
+
+    report = font_registry.report()
+    assert set(report) == {"STSong-Light", "TestImpact"}, report
+    assert all(seconds >= 0 for seconds in report.values())
+
+    # A second document reuses the parsed font.
+    font = font_registry.load("TestImpact")
+    second = PDFGenerator(None)
+    second.get_drawer().draw_string(10, 10, font="TestImpact", font_size=12, text="7")
+    assert second.save().startswith(b"%PDF-") and font_registry.load("TestImpact") is font
+    assert font_registry.report() == report
+
+    print("Roy PDF library font registry test passed.")
+
+
+def main() -> None:
+    # Runs first: it checks that nothing has loaded a font yet.
+    check_font_registry()
+    check_graphics_state_cache()
+    check_templates()
+    check_stream_output()
+    check_paragraph_styles()
+
+
+if __name__ == "__main__":
+    main()